@@ -2,8 +2,12 @@
 공통 유틸리티 함수
 """
 import logging
-from typing import Any, Dict
-from datetime import datetime
+import time
+from typing import Any, Dict, Tuple
+from datetime import datetime, timezone
+
+# (epoch 초, ISO 문자열) - 같은 초 안의 응답은 포맷팅된 문자열을 재사용
+_TS_CACHE: Tuple[int, str] = (0, "")
 
 
 def setup_logging(service_name: str, level: str = "INFO") -> logging.Logger:
@@ -22,13 +26,22 @@ def setup_logging(service_name: str, level: str = "INFO") -> logging.Logger:
     return logger
 
 
+def _now_iso() -> str:
+    """초 단위로 캐시한 UTC ISO 타임스탬프 (매 응답마다 datetime 포맷팅 방지)"""
+    global _TS_CACHE
+    now = int(time.time())
+    if _TS_CACHE[0] != now:
+        _TS_CACHE = (now, datetime.fromtimestamp(now, timezone.utc).isoformat())
+    return _TS_CACHE[1]
+
+
 def create_response(data: Any, message: str = "Success", status: str = "success") -> Dict:
     """표준 응답 형식 생성"""
     return {
         "status": status,
         "message": message,
         "data": data,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _now_iso()
     }
 
 
@@ -38,6 +51,6 @@ def create_error_response(message: str, error_code: str = "UNKNOWN_ERROR") -> Di
         "status": "error",
         "message": message,
         "error_code": error_code,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _now_iso()
     }
 
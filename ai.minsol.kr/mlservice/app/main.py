@@ -5,10 +5,20 @@ import sys
 import csv
 import os
 import logging
+import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+# orjson이 설치된 경우 응답 직렬화에 ORJSONResponse 사용 (stdlib json보다 빠름)
+try:
+    import orjson  # noqa: F401
+    DefaultResponse = ORJSONResponse
+except ImportError:
+    DefaultResponse = JSONResponse
 
 # 공통 모듈 경로 추가 (최우선)
 current_file = Path(__file__).resolve()
@@ -19,6 +29,11 @@ base_path_str = str(base_dir)
 if base_path_str not in sys.path:
     sys.path.insert(0, base_path_str)
 
+# 로컬 실행 시 저장소 루트의 common 패키지 경로 추가 (Docker에서는 /app/common으로 복사됨)
+repo_root = base_dir.parent
+if (repo_root / "common").is_dir() and str(repo_root) not in sys.path:
+    sys.path.insert(1, str(repo_root))
+
 # Docker 환경 확인 및 /app 경로 추가
 if os.path.exists("/app"):
     if "/app" not in sys.path:
@@ -49,10 +64,14 @@ logger_temp = logging.getLogger(__name__)
 # titanic 라우터 import
 try:
     from app.titanic.titanic_router import router as titanic_router
+    from app.titanic.titanic_router import init_service as init_titanic_service
+    from app.titanic.titanic_router import shutdown_service as shutdown_titanic_service
 except ImportError as e:
     logger_temp.warning(f"titanic_router import 실패: {e}")
     from fastapi import APIRouter
     titanic_router = APIRouter()
+    init_titanic_service = None
+    shutdown_titanic_service = None
 
 # seoul 라우터 import
 try:
@@ -64,11 +83,15 @@ except ImportError as e:
 # usa 라우터 import
 try:
     from app.us_unemployment.router import router as usa_router
+    from app.us_unemployment.router import get_service as get_usa_service
+    from app.us_unemployment.service import close_browser as close_usa_browser
     logger_temp.info("usa_router import 성공")
 except ImportError as e:
     logger_temp.error(f"usa_router import 실패: {e}", exc_info=True)
     from fastapi import APIRouter
     usa_router = APIRouter()
+    get_usa_service = None
+    close_usa_browser = None
 
 # nlp 라우터 import
 try:
@@ -94,8 +117,29 @@ except ImportError as e:
 # 로깅 설정 (이미 위에서 basicConfig 설정됨)
 logger = setup_logging(config.service_name)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서비스 시작/종료 시 실행 (서비스 인스턴스는 트래픽 전에 워커당 한 번 생성)"""
+    logger.info(f"{config.service_name} v{config.service_version} started")
+    if init_titanic_service is not None:
+        await init_titanic_service(app)
+    if get_usa_service is not None:
+        try:
+            # 지리/실업률 데이터 로드는 블로킹 I/O이므로 스레드에서 실행
+            await asyncio.to_thread(get_usa_service)
+        except Exception as e:
+            logger.warning(f"USUnemploymentService 초기화 실패 (요청 시 다시 시도합니다): {str(e)}")
+    yield
+    if shutdown_titanic_service is not None:
+        await shutdown_titanic_service(app)
+    if close_usa_browser is not None:
+        close_usa_browser()
+    logger.info(f"{config.service_name} shutting down")
+
+
 # FastAPI 앱 생성
 app = FastAPI(
+    lifespan=lifespan,
     title="Titanic Service API",
     description="""
     ## 타이타닉 데이터 서비스 API
@@ -119,6 +163,7 @@ app = FastAPI(
     - OpenAPI Schema: `/openapi.json`
     """,
     version=config.service_version,
+    default_response_class=DefaultResponse,
     contact={
         "name": "ML Service Team",
         "email": "support@labzang.com",
@@ -141,6 +186,9 @@ app = FastAPI(
 )
 
 # CORS 설정
+# 지도 HTML처럼 큰 응답은 gzip으로 압축 (작은 JSON 응답은 그대로)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -180,18 +228,6 @@ async def root():
     }
 
 
-@app.on_event("startup")
-async def startup_event():
-    """서비스 시작 시 실행"""
-    logger.info(f"{config.service_name} v{config.service_version} started")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """서비스 종료 시 실행"""
-    logger.info(f"{config.service_name} shutting down")
-
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=config.port)
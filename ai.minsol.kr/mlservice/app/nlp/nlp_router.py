@@ -5,40 +5,12 @@ from fastapi import APIRouter, HTTPException, Query, Body
 from fastapi.responses import JSONResponse, FileResponse
 from typing import Optional, Dict, Any
 from pathlib import Path
-import sys
 import logging
-from datetime import datetime
 import pandas as pd
 
-# 공통 모듈 경로 추가
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
-
 from app.nlp.emma.emma_wordcloud import EmmaWordCloud
 from app.nlp.samsung.samsung_wordcloud import SamsungWordCloud
-
-# common 모듈 import 시도
-try:
-    from common.utils import create_response, create_error_response, setup_logging
-except ImportError:
-    # common 모듈이 없을 경우 기본 함수 정의
-    def setup_logging(name: str):
-        return logging.getLogger(name)
-    
-    def create_response(data: Any, message: str = "Success", status: str = "success") -> Dict:
-        return {
-            "status": status,
-            "message": message,
-            "data": data,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    
-    def create_error_response(message: str, error_code: str = "UNKNOWN_ERROR") -> Dict:
-        return {
-            "status": "error",
-            "message": message,
-            "error_code": error_code,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+from common.utils import create_response, create_error_response, setup_logging
 
 # Logger 초기화
 logger = logging.getLogger(__name__)
@@ -1,10 +1,5 @@
 from fastapi import APIRouter, HTTPException, Query, Body
 from typing import List, Dict, Any, Optional
-from pathlib import Path
-import sys
-
-# 공통 모듈 경로 추가
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from app.seoul_crime.seoul_service import SeoulService
 from common.utils import create_response, create_error_response
@@ -34,16 +29,19 @@ async def seoul_root():
         message="Seoul Service is running"
     )
 
-async def _preprocess_data():
+async def _preprocess_data(preview: bool = False):
     """
     데이터 전처리 및 히트맵 생성 (공통 함수)
     
+    Args:
+        preview: 각 DataFrame의 상위 3행 미리보기 포함 여부
+    
     Returns:
         dict: 전처리 결과 및 히트맵 생성 정보
     """
     try:
         service = get_service()
-        result = service.preprocess()
+        result = service.preprocess(preview=preview)
         
         # 히트맵 파일 경로 추가
         from pathlib import Path
@@ -69,22 +67,26 @@ async def _preprocess_data():
 
 
 @router.get("/preprocess")
-async def preprocess_data_get():
+async def preprocess_data_get(
+    preview: bool = Query(False, description="상위 3행 미리보기 포함 여부")
+):
     """
     데이터 전처리 및 히트맵 생성 (GET)
     
     Returns:
         dict: 전처리 결과 및 히트맵 생성 정보
     """
-    return await _preprocess_data()
+    return await _preprocess_data(preview=preview)
 
 
 @router.post("/preprocess")
-async def preprocess_data_post():
+async def preprocess_data_post(
+    preview: bool = Query(False, description="상위 3행 미리보기 포함 여부")
+):
     """
     데이터 전처리 및 히트맵 생성 (POST)
     
     Returns:
         dict: 전처리 결과 및 히트맵 생성 정보
     """
-    return await _preprocess_data()
\ No newline at end of file
+    return await _preprocess_data(preview=preview)
\ No newline at end of file
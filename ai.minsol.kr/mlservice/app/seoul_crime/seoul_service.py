@@ -1,6 +1,9 @@
 import sys
+from typing import Optional
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from pathlib import Path
 from app.seoul_crime.seoul_method import SeoulMethod
 from app.seoul_crime.seoul_data import SeoulData
@@ -13,6 +16,17 @@ import seaborn as sns
 
 logger = logging.getLogger(__name__)
 
+# 카카오맵 싱글턴 (API 키가 없을 때 import 단계에서 실패하지 않도록 최초 사용 시 한 번만 생성)
+_GMAPS: Optional[KakaoMapSingleton] = None
+
+
+def _get_gmaps() -> KakaoMapSingleton:
+    """모듈 수준에 캐시된 KakaoMapSingleton 반환"""
+    global _GMAPS
+    if _GMAPS is None:
+        _GMAPS = KakaoMapSingleton()
+    return _GMAPS
+
 class SeoulService:
 
     
@@ -22,7 +36,13 @@ class SeoulService:
         self.crime_rate_columns = ['살인검거율', '강도검거율', '강간검거율', '절도검거율', '폭력검거율']
         self.crime_columns = ['살인', '강도', '강간', '절도', '폭력']
     
-    def preprocess(self):
+    def preprocess(self, preview: bool = False):
+        """
+        cctv/crime/pop 데이터 전처리 및 머지, 히트맵 생성
+
+        Args:
+            preview: True이면 각 DataFrame의 상위 3행 미리보기를 결과에 포함
+        """
         data_dir = Path(self.data.dname)
         cctv_path = data_dir / "cctv.csv"
         crime_path = data_dir / "crime.csv"
@@ -39,8 +59,8 @@ class SeoulService:
         # axis = 0 방향으로 위로부터 2, 3, 4번째 행을 제거 
         
         # 먼저 원본 데이터 구조 확인
-        logger.info(f"pop 원본 shape: {pop.shape}")
-        logger.info(f"pop 원본 columns: {pop.columns.tolist()}")
+        logger.info("pop 원본 shape: %s", pop.shape)
+        logger.info("pop 원본 columns: %s", pop.columns.tolist())
         
         # axis=0: 위로부터 2, 3, 4번째 행(인덱스 1, 2, 3) 제거 (먼저 행 제거)
         pop = pop.drop([1, 2, 3], axis=0)
@@ -66,9 +86,11 @@ class SeoulService:
         # 인덱스 리셋
         pop = pop.reset_index(drop=True)
         
-        logger.info(f"  cctv 탑 5 : {cctv.head(5).to_string()}")
-        logger.info(f"  crime 탑 5 : {crime.head(5).to_string()}")
-        logger.info(f"  pop 탑 5 : {pop.head(5).to_string()}")
+        # DataFrame 문자열 렌더링은 비용이 크므로 INFO 레벨이 활성화된 경우에만 수행
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("  cctv 탑 5 : %s", cctv.head(5).to_string())
+            logger.info("  crime 탑 5 : %s", crime.head(5).to_string())
+            logger.info("  pop 탑 5 : %s", pop.head(5).to_string())
         
         # cctv와 pop 머지 전략
         # - cctv의 "기관명"과 pop의 "자치구"를 키로 사용
@@ -76,8 +98,8 @@ class SeoulService:
         # - "기관명"과 "자치구"는 같은 값이지만 컬럼명이 다르므로 left_on, right_on 사용
         
         # 머지 전에 컬럼명 확인 및 중복 컬럼 체크
-        logger.info(f"cctv 컬럼: {cctv.columns.tolist()}")
-        logger.info(f"pop 컬럼: {pop.columns.tolist()}")
+        logger.info("cctv 컬럼: %s", cctv.columns.tolist())
+        logger.info("pop 컬럼: %s", pop.columns.tolist())
         
         # 중복되는 컬럼 확인 (키 컬럼 제외)
         cctv_cols = set(cctv.columns) - {'기관명'}
@@ -85,7 +107,7 @@ class SeoulService:
         duplicate_cols = cctv_cols & pop_cols
         
         if duplicate_cols:
-            logger.warning(f"중복되는 컬럼이 발견되었습니다: {duplicate_cols}")
+            logger.warning("중복되는 컬럼이 발견되었습니다: %s", duplicate_cols)
             logger.info("머지 시 suffixes를 사용하여 중복 컬럼을 구분합니다.")
         
         # cctv의 "기관명"과 pop의 "자치구"를 키로 머지
@@ -106,9 +128,10 @@ class SeoulService:
             else:
                 logger.warning("'기관명'과 '자치구'의 값이 다릅니다. 두 컬럼 모두 유지합니다.")
         
-        logger.info(f"머지 완료: cctv_pop shape = {cctv_pop.shape}")
-        logger.info(f"cctv_pop 컬럼: {cctv_pop.columns.tolist()}")
-        logger.info(f"cctv_pop 탑 5:\n{cctv_pop.head(5).to_string()}")
+        logger.info("머지 완료: cctv_pop shape = %s", cctv_pop.shape)
+        logger.info("cctv_pop 컬럼: %s", cctv_pop.columns.tolist())
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("cctv_pop 탑 5:\n%s", cctv_pop.head(5).to_string())
 
         # 관서명에 따른 경찰서 주소 찾기
         station_names = [] # 경찰서 관서명 리스트
@@ -118,18 +141,12 @@ class SeoulService:
         station_addrs = []
         station_lats = []
         station_lngs = []
-        gmaps1 =  KakaoMapSingleton()
-        gmaps2 =  KakaoMapSingleton()
-        if gmaps1 is gmaps2:
-            print("동일한 객체 입니다.")
-        else:
-            print("다른 객체 입니다.")
-        gmaps = KakaoMapSingleton() # 카카오맵 객체 생성
+        gmaps = _get_gmaps() # 카카오맵 객체
         for name in station_names:
             try:
                 tmp = gmaps.geocode(name, language = 'ko')
                 if not tmp or len(tmp) == 0:
-                    logger.warning(f"{name}의 geocode 결과가 비어있습니다.")
+                    logger.warning("%s의 geocode 결과가 비어있습니다.", name)
                     station_addrs.append("")
                     station_lats.append(0.0)
                     station_lngs.append(0.0)
@@ -145,7 +162,7 @@ class SeoulService:
                 station_lats.append(lat)
                 station_lngs.append(lng)
             except Exception as e:
-                logger.error(f"{name}의 geocode 처리 중 오류 발생: {str(e)}")
+                logger.error("%s의 geocode 처리 중 오류 발생: %s", name, e)
                 station_addrs.append("")
                 station_lats.append(0.0)
                 station_lngs.append(0.0)
@@ -164,12 +181,12 @@ class SeoulService:
                     tmp_gu = tmp_gu_list[0]
                     gu_names.append(tmp_gu)
                 else:
-                    logger.warning(f"주소에서 '구'를 찾을 수 없습니다: {addr}")
+                    logger.warning("주소에서 '구'를 찾을 수 없습니다: %s", addr)
                     gu_names.append("")
             except Exception as e:
-                logger.error(f"주소 파싱 중 오류 발생: {addr}, {str(e)}")
+                logger.error("주소 파싱 중 오류 발생: %s, %s", addr, e)
                 gu_names.append("")
-        [print(f"🔥💧자치구 리스트 2: {gu_names}")]
+        logger.debug("자치구 리스트 2: %s", gu_names)
         
         # crime 데이터프레임에 주소와 자치구 컬럼 추가, 관서명 컬럼 내용 변경
         crime['자치구'] = gu_names
@@ -185,8 +202,8 @@ class SeoulService:
             how='inner'
         )
         
-        logger.info(f"crime_pop 머지 완료: shape = {crime_pop.shape}")
-        logger.info(f"crime_pop 컬럼: {crime_pop.columns.tolist()}")
+        logger.info("crime_pop 머지 완료: shape = %s", crime_pop.shape)
+        logger.info("crime_pop 컬럼: %s", crime_pop.columns.tolist())
         
         # 자치구별로 그룹화하여 합치기
         # 숫자 컬럼은 합계, 관서명은 콤마로 연결
@@ -227,31 +244,32 @@ class SeoulService:
         crime = crime_merged[new_column_order]
         
         # 주소 정보는 터미널에 출력 (CSV에는 저장하지 않음)
-        logger.info("=" * 50)
-        logger.info("주소 정보 (터미널 출력용):")
-        logger.info("=" * 50)
-        for idx, row in crime.iterrows():
-            gu = row['자치구']
-            stations = row['관서명'].split(', ')
-            # 해당 자치구의 주소 찾기
-            addresses = []
-            for station in stations:
-                if station in station_names:
-                    idx_in_original = station_names.index(station)
-                    if idx_in_original < len(station_addrs) and station_addrs[idx_in_original]:
-                        addresses.append(f"{station}: {station_addrs[idx_in_original]}")
-            if addresses:
-                logger.info(f"{gu}:")
-                for addr in addresses:
-                    logger.info(f"  {addr}")
-        logger.info("=" * 50)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("=" * 50)
+            logger.info("주소 정보 (터미널 출력용):")
+            logger.info("=" * 50)
+            for idx, row in crime.iterrows():
+                gu = row['자치구']
+                stations = row['관서명'].split(', ')
+                # 해당 자치구의 주소 찾기
+                addresses = []
+                for station in stations:
+                    if station in station_names:
+                        idx_in_original = station_names.index(station)
+                        if idx_in_original < len(station_addrs) and station_addrs[idx_in_original]:
+                            addresses.append(f"{station}: {station_addrs[idx_in_original]}")
+                if addresses:
+                    logger.info("%s:", gu)
+                    for addr in addresses:
+                        logger.info("  %s", addr)
+            logger.info("=" * 50)
         
         # 데이터 확인
-        logger.info(f"crime 데이터프레임 shape: {crime.shape}")
-        logger.info(f"crime 컬럼 순서: {crime.columns.tolist()}")
-        logger.info(f"자치구 샘플: {crime['자치구'].head(3).tolist()}")
-        logger.info(f"관서명 샘플: {crime['관서명'].head(3).tolist()}")
-        logger.info(f"인구 샘플: {crime['인구'].head(3).tolist()}")
+        logger.info("crime 데이터프레임 shape: %s", crime.shape)
+        logger.info("crime 컬럼 순서: %s", crime.columns.tolist())
+        logger.info("자치구 샘플: %s", crime['자치구'].head(3).tolist())
+        logger.info("관서명 샘플: %s", crime['관서명'].head(3).tolist())
+        logger.info("인구 샘플: %s", crime['인구'].head(3).tolist())
         
         # save 폴더에 새로운 CSV 파일 생성 (주소 컬럼 제외)
         save_dir = Path(self.data.sname)
@@ -264,23 +282,23 @@ class SeoulService:
             if '주소' in crime_to_save.columns:
                 crime_to_save = crime_to_save.drop(columns=['주소'])
             
-            crime_to_save.to_csv(str(crime_output_path), index=False, encoding='utf-8-sig')
-            logger.info(f"새로운 CSV 파일이 생성되었습니다: {crime_output_path}")
-            logger.info(f"컬럼 순서: 자치구, 관서명, 인구, 그리고 나머지 기존 컬럼들 (주소 제외)")
-            logger.info(f"파일 shape: {crime.shape}, 컬럼: {crime.columns.tolist()}")
+            # pyarrow CSV writer 사용 (utf-8-sig 호환을 위해 BOM을 먼저 기록)
+            table = pa.Table.from_pandas(crime_to_save, preserve_index=False)
+            with open(crime_output_path, 'wb') as f:
+                f.write(b'\xef\xbb\xbf')
+                pacsv.write_csv(table, f)
+            logger.info("새로운 CSV 파일이 생성되었습니다: %s", crime_output_path)
+            logger.info("컬럼 순서: 자치구, 관서명, 인구, 그리고 나머지 기존 컬럼들 (주소 제외)")
+            logger.info("파일 shape: %s, 컬럼: %s", crime.shape, crime.columns.tolist())
             
-            # 저장 확인
-            if crime_output_path.exists():
-                logger.info(f"파일 저장 확인: {crime_output_path} 파일이 존재합니다.")
-                # 저장된 파일 읽어서 확인
-                saved_crime = pd.read_csv(str(crime_output_path), encoding='utf-8-sig')
-                logger.info(f"저장된 파일 컬럼 순서: {saved_crime.columns.tolist()}")
-                logger.info(f"저장된 파일 shape: {saved_crime.shape}")
-                logger.info(f"저장된 파일 첫 3행:\n{saved_crime.head(3).to_string()}")
-            else:
-                logger.error(f"파일 저장 실패: {crime_output_path} 파일이 생성되지 않았습니다.")
+            # 저장 확인 (파일을 다시 읽지 않고 메모리상의 데이터로 확인)
+            if not crime_output_path.exists():
+                logger.error("파일 저장 실패: %s 파일이 생성되지 않았습니다.", crime_output_path)
+            logger.info("저장된 파일 shape(예상): %s, 컬럼: %s", crime_to_save.shape, list(crime_to_save.columns))
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("저장된 파일 첫 3행:\n%s", crime_to_save.head(3).to_string())
         except Exception as e:
-            logger.error(f"CSV 파일 저장 중 오류 발생: {str(e)}")
+            logger.error("CSV 파일 저장 중 오류 발생: %s", e)
             logger.exception(e)
             raise
 
@@ -300,10 +318,10 @@ class SeoulService:
             "pop_columns": pop.columns.tolist(),
             "cctv_pop_rows": len(cctv_pop),
             "cctv_pop_columns": cctv_pop.columns.tolist(),
-            "cctv_preview": cctv.head(3).to_dict(orient='records'),
-            "crime_preview": crime.head(3).to_dict(orient='records'),
-            "pop_preview": pop.head(3).to_dict(orient='records'),
-            "cctv_pop_preview": cctv_pop.head(3).to_dict(orient='records'),
+            "cctv_preview": cctv.head(3).to_dict(orient='records') if preview else [],
+            "crime_preview": crime.head(3).to_dict(orient='records') if preview else [],
+            "pop_preview": pop.head(3).to_dict(orient='records') if preview else [],
+            "cctv_pop_preview": cctv_pop.head(3).to_dict(orient='records') if preview else [],
             "message": "데이터 전처리 및 머지가 완료되었습니다"
         }
     
@@ -337,7 +355,7 @@ class SeoulService:
                     if font_name in font_list:
                         plt.rcParams['font.family'] = font_name
                         font_found = True
-                        logger.info(f"한글 폰트 설정 완료: {font_name}")
+                        logger.info("한글 폰트 설정 완료: %s", font_name)
                         break
                 except Exception as e:
                     continue
@@ -446,10 +464,10 @@ class SeoulService:
             plt.savefig(str(output_path), dpi=300, bbox_inches='tight')
             plt.close()  # 메모리 해제
             
-            logger.info(f"히트맵이 저장되었습니다: {output_path}")
-            logger.info(f"인구 대비 범죄 비율 히트맵 생성 완료")
+            logger.info("히트맵이 저장되었습니다: %s", output_path)
+            logger.info("인구 대비 범죄 비율 히트맵 생성 완료")
             
         except Exception as e:
-            logger.error(f"히트맵 생성 중 오류 발생: {str(e)}")
+            logger.error("히트맵 생성 중 오류 발생: %s", e)
             logger.exception(e)
             # 히트맵 생성 실패해도 전처리는 계속 진행
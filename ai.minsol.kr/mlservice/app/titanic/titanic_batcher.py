@@ -0,0 +1,78 @@
+"""
+타이타닉 단건 예측 마이크로 배처
+동시에 들어온 /predict 요청을 짧은 시간 동안 모아 한 번의 predict_records 호출로 처리
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.titanic.titanic_service import TitanicService
+
+
+class PredictBatcher:
+    """asyncio 큐에 쌓인 단건 예측 요청을 최대 max_batch개, max_wait_ms 이내로 묶어서 예측"""
+
+    def __init__(self, service: TitanicService, max_batch: int = 64, max_wait_ms: float = 5.0):
+        self.service = service
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.logger = logging.getLogger(__name__)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self):
+        """이벤트 루프 안(lifespan 시작 시)에서 백그라운드 워커 시작"""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """백그라운드 워커 종료"""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def predict(self, record: Dict[str, Any]) -> int:
+        """승객 레코드 하나를 큐에 넣고 배치 예측 결과를 기다림"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((record, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[Dict[str, Any], asyncio.Future]]:
+        """첫 요청을 기다린 뒤 max_wait 동안 추가 요청을 모음"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            records = [record for record, _ in batch]
+            try:
+                # 모델 예측은 CPU 작업이므로 스레드 풀에서 한 번에 실행
+                predictions = await run_in_threadpool(self.service.predict_records, records)
+            except Exception as e:
+                self.logger.error(f"배치 예측 실패 ({len(batch)}건): {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), pred in zip(batch, predictions):
+                # 클라이언트 연결이 끊겨 취소된 요청은 건너뜀
+                if not future.done():
+                    future.set_result(int(pred))
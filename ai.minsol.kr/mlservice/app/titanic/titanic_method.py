@@ -1,19 +1,77 @@
+import re
 import pandas as pd
 import numpy as np
 from pandas import DataFrame
 from pathlib import Path
 from app.titanic.titanic_dataset import TitanicDataSet
-from typing import Tuple
+from typing import Optional, Tuple
 import logging
 
+# train.csv / test.csv 공통 컬럼의 명시적 dtype (타입 추론 생략)
+CSV_DTYPES = {
+    'PassengerId': 'int32',
+    'Pclass': 'int8',
+    'Sex': 'category',
+    'Age': 'float32',
+    'SibSp': 'int8',
+    'Parch': 'int8',
+    # Fare는 사분위수 경계를 구하므로 float64로 읽음 (float32로 반올림된 경계는 요청의 float64 요금과 구간이 달라짐)
+    'Fare': 'float64',
+    'Embarked': 'category',
+}
+
+# preprocess()에서 사용하는 컬럼 (SibSp, Parch, Cabin, Ticket은 파싱 단계에서 제외)
+PREPROCESS_COLUMNS = ['PassengerId', 'Pclass', 'Name', 'Sex', 'Age', 'Fare', 'Embarked']
+
+# Embarked 인코딩 순서 (S=1, C=2, Q=3)
+EMBARKED_CATEGORIES = ['S', 'C', 'Q']
+# 단건 인코딩용 dict 매핑 (해시 조회)
+EMBARKED_LABEL_MAP = {c: i + 1 for i, c in enumerate(EMBARKED_CATEGORIES)}
+
+# Age 구간 경계값: bins [-1, 0, 5, 12, 18, 24, 35, 60, inf]의 내부 경계
+AGE_BIN_EDGES = np.array([0, 5, 12, 18, 24, 35, 60], dtype=np.float64)
+
+# Title 그룹화 및 Label Encoding: Mr=0, Ms=1, Mrs=2, Master=3, Royal=4, Rare=5
+# 일반적인 타이틀: Mr, Mrs, Miss, Master
+# Royal 타이틀: Lady, Countess, Sir, Don, Dona 등
+TITLE_LABEL_MAP = {
+    'Mr': 0,
+    'Miss': 1,
+    'Mlle': 1,  # Mademoiselle -> Ms
+    'Ms': 1,
+    'Mrs': 2,
+    'Mme': 2,  # Madame -> Mrs
+    'Master': 3,
+    'Lady': 4,
+    'Countess': 4,
+    'Sir': 4,
+    'Don': 4,
+    'Dona': 4,
+    'Jonkheer': 4
+}
+TITLE_RARE = 5
+
+# 전처리 후 정수 코드로 표현되는 피처 (int8로 다운캐스트)
+ORDINAL_COLUMNS = ['Pclass', 'Age', 'Fare', 'Embarked', 'Gender', 'Title']
+
+# Name에서 Title을 추출하는 정규표현식 (예: "Braund, Mr. Owen Harris" -> "Mr")
+_TITLE_RE = re.compile(r',\s*([^\.]+)\.')
+
 class TitanicMethod(object): 
 
     def __init__(self):
         self.dataset = TitanicDataSet()
         self.logger = logging.getLogger(__name__)
+        # fare_ordinal에서 계산한 사분위수 경계 (train 기준)
+        self.fare_edges = None
 
-    def read_csv(self, fname: str) -> pd.DataFrame:
-        return pd.read_csv(fname)
+    def read_csv(self, fname: str, dtype: Optional[dict] = None, usecols: Optional[list] = None) -> pd.DataFrame:
+        # pyarrow 멀티스레드 CSV 파서 + 명시적 dtype
+        # usecols를 지정하면 제외된 컬럼은 파싱하지 않음 (dtype도 읽는 컬럼으로 한정)
+        dtype = CSV_DTYPES if dtype is None else dtype
+        if usecols is not None:
+            dtype = {col: t for col, t in dtype.items() if col in usecols}
+        return pd.read_csv(fname, engine='pyarrow', dtype=dtype, usecols=usecols)
 
     def create_df(self, df: DataFrame, label: str) -> pd.DataFrame:
         return df.drop(columns=[label])
@@ -22,11 +80,10 @@ class TitanicMethod(object):
         return df[[label]]
 
     def drop_feature(self, this, *feature: str) -> object:
-        [i.drop(j, axis=1, inplace=True) for j in feature for i in [this.train,this.test ] ]
-
-        # for i in [this.train, this.test]:
-        #     for j in feature:
-        #         i.drop(j, axis=1, inplace=True)
+        # 프레임마다 한 번의 drop으로 모든 컬럼 제거
+        cols = list(feature)
+        this.train.drop(columns=cols, inplace=True)
+        this.test.drop(columns=cols, inplace=True)
  
         return this
 
@@ -36,6 +93,8 @@ class TitanicMethod(object):
             print(i.isnull().sum())
 
     # 척도 : nominal, ordinal, interval, ratio
+    # 아래 피처 변환 메서드들은 전달받은 df의 컬럼을 직접 수정합니다.
+    # 원본 보존이 필요하면 호출하는 쪽에서 한 번만 copy() 하세요.
 
     def pclass_ordinal(self, df: DataFrame) -> pd.DataFrame:
         """
@@ -44,46 +103,31 @@ class TitanicMethod(object):
         - 1등석 > 2등석 > 3등석이므로, 생존률 관점에서 1이 가장 좋고 3이 가장 안 좋습니다.
         """
         # Pclass는 이미 ordinal이므로 그대로 사용하되, 명시적으로 정수형으로 변환
-        df = df.copy()
         df["Pclass"] = df["Pclass"].astype(int)
         # 기존 Pclass는 유지 (필요시 drop_feature로 제거 가능)
         return df
 
-    def fare_ordinal(self, df: DataFrame) -> pd.DataFrame:
+    def fare_ordinal(self, df: DataFrame, edges: Optional[np.ndarray] = None) -> pd.DataFrame:
         """
         Fare: 요금 (연속형 ratio 척도이지만, 여기서는 구간화하여 서열형으로 사용)
         - 결측치를 중앙값으로 채우고, 사분위수로 binning하여 ordinal 피처 생성
+        - edges가 없으면 df의 사분위수 경계를 계산해 self.fare_edges에 저장하고,
+          있으면(예: test/예측 데이터) 주어진 경계(train 기준)로 구간화
         """
-        df = df.copy()
-        
         # 결측치를 중앙값으로 채우기
-        if df["Fare"].isnull().any():
+        missing_fare = int(df["Fare"].isnull().sum())
+        if missing_fare:
             median_fare = df["Fare"].median()
-            df["Fare"].fillna(median_fare, inplace=True)
-            self.logger.info(f"Fare 결측치 {df['Fare'].isnull().sum()}개를 중앙값 {median_fare}로 채웠습니다")
+            df = df.fillna({"Fare": median_fare})
+            self.logger.info(f"Fare 결측치 {missing_fare}개를 중앙값 {median_fare}로 채웠습니다")
         
-        # 사분위수로 binning하여 ordinal 피처 생성
-        try:
-            df["Fare_ordinal"] = pd.qcut(
-                df["Fare"], 
-                q=4, 
-                labels=[0, 1, 2, 3],
-                duplicates="drop"
-            ).astype(int)
-        except (ValueError, TypeError):
-            # 중복값이 많아 qcut이 실패할 경우, cut 사용
-            fare_min = df["Fare"].min()
-            fare_max = df["Fare"].max()
-            df["Fare_ordinal"] = pd.cut(
-                df["Fare"],
-                bins=4,
-                labels=[0, 1, 2, 3],
-                include_lowest=True
-            ).astype(int)
+        fares = df["Fare"].to_numpy(dtype=np.float64)
+        if edges is None:
+            edges = np.quantile(fares, [0.25, 0.5, 0.75])
+            self.fare_edges = edges
         
-        # 원본 Fare 컬럼을 Fare_ordinal 값으로 대체
-        df["Fare"] = df["Fare_ordinal"]
-        df.drop(columns=["Fare_ordinal"], inplace=True)
+        # 사분위수 경계로 binning (오른쪽 닫힌 구간이므로 side='left', pd.qcut 라벨 0~3과 동일)
+        df["Fare"] = np.searchsorted(edges, fares, side='left').astype(int)
         
         return df
 
@@ -92,21 +136,15 @@ class TitanicMethod(object):
         Embarked: 탑승 항구 (C, Q, S)
         - Label encoding 사용: S=1, C=2, Q=3
         """
-        df = df.copy()
-        
         # 결측치를 최빈값으로 채우기
         if df["Embarked"].isnull().any():
             mode_embarked = df["Embarked"].mode()[0] if not df["Embarked"].mode().empty else "S"
-            df["Embarked"].fillna(mode_embarked, inplace=True)
+            df = df.fillna({"Embarked": mode_embarked})
             self.logger.info(f"Embarked 결측치를 최빈값 {mode_embarked}로 채웠습니다")
         
         # Label encoding: S=1, C=2, Q=3
-        embarked_label_map = {
-            'S': 1,
-            'C': 2,
-            'Q': 3
-        }
-        df["Embarked"] = df["Embarked"].map(embarked_label_map).astype(int)
+        # 고정된 카테고리 순서의 Categorical codes(해시 기반)를 사용하고 1부터 시작하도록 보정
+        df["Embarked"] = pd.Categorical(df["Embarked"], categories=EMBARKED_CATEGORIES).codes.astype(int) + 1
         
         return df
 
@@ -115,8 +153,6 @@ class TitanicMethod(object):
         Sex: 성별 (male, female)
         - nominal 척도이므로 이진 인코딩 사용
         """
-        df = df.copy()
-        
         # 원본 Sex 컬럼을 "Gender" 로 변경하고 숫자로 변환 (male=0, female=1)
         df["Gender"] = (df["Sex"] == "female").astype(int)
         df.drop(columns=["Sex"], inplace=True)
@@ -138,23 +174,17 @@ class TitanicMethod(object):
           6: 중년 (36-60세)
           7: 노년 (60세 이상)
         """
-        df = df.copy()
-        # 7개 구간을 만들기 위해 bins 조정: [-1, 0, 5, 12, 18, 24, 35, 60, inf] -> 8개 경계값 = 7개 구간
-        bins = [-1, 0, 5, 12, 18, 24, 35, 60, np.inf]
-        
         # 결측치를 중앙값으로 채우기
-        if df["Age"].isnull().any():
+        missing_age = int(df["Age"].isnull().sum())
+        if missing_age:
             median_age = df["Age"].median()
-            df["Age"].fillna(median_age, inplace=True)
-            self.logger.info(f"Age 결측치 {df['Age'].isnull().sum()}개를 중앙값 {median_age}로 채웠습니다")
+            df = df.fillna({"Age": median_age})
+            self.logger.info(f"Age 결측치 {missing_age}개를 중앙값 {median_age}로 채웠습니다")
         
-        # 나이를 구간화하여 ordinal 피처 생성 (7개 구간: 0-6)
-        df["Age"] = pd.cut(
-            df["Age"],
-            bins=bins,
-            labels=[0, 1, 2, 3, 4, 5, 6, 7],
-            include_lowest=True
-        ).astype(int)
+        # 나이를 구간화하여 ordinal 피처 생성 (8개 구간: 0-7)
+        # 오른쪽 닫힌 구간 (a, b]이므로 side='left'로 경계값 개수를 세면 pd.cut 라벨과 동일
+        ages = df["Age"].to_numpy(dtype=np.float64)
+        df["Age"] = np.searchsorted(AGE_BIN_EDGES, ages, side='left').astype(int)
         
         # 원본 Age 컬럼은 유지
         return df
@@ -166,53 +196,12 @@ class TitanicMethod(object):
         - nominal 척도이므로 Label Encoding 사용 (0~5)
         - 매핑: Mr=0, Ms=1, Mrs=2, Master=3, Royal=4, Rare=5
         """
-        df = df.copy()
-        
         # Name 컬럼에서 Title 추출 (정규표현식 사용)
         # 예: "Braund, Mr. Owen Harris" -> "Mr"
-        df["Title"] = df["Name"].str.extract(r',\s*([^\.]+)\.', expand=False)
-        
-        # 타이틀 정리 및 그룹화
-        # 일반적인 타이틀: Mr, Mrs, Miss, Master
-        # Royal 타이틀: Lady, Countess, Sir, Don, Dona 등
-        title_mapping = {
-            'Mr': 'Mr',
-            'Miss': 'Ms',
-            'Mlle': 'Ms',  # Mademoiselle -> Ms
-            'Ms': 'Ms',
-            'Mrs': 'Mrs',
-            'Mme': 'Mrs',  # Madame -> Mrs
-            'Master': 'Master',
-            'Lady': 'Royal',
-            'Countess': 'Royal',
-            'Sir': 'Royal',
-            'Don': 'Royal',
-            'Dona': 'Royal',
-            'Jonkheer': 'Royal'
-        }
-        
-        # 타이틀 매핑 적용
-        df["Title"] = df["Title"].map(title_mapping).fillna('Rare')
-        
-        # 희소한 타이틀을 "Rare" 그룹으로 묶기
-        common_titles = ["Mr", "Ms", "Mrs", "Master", "Royal"]
-        df["Title"] = df["Title"].apply(
-            lambda x: x if x in common_titles else "Rare"
-        )
-        
-        # 결측치 처리 (혹시 모를 경우를 대비)
-        if df["Title"].isnull().any():
-            df["Title"].fillna("Mr", inplace=True)  # 가장 많은 타이틀로 채우기
+        df["Title"] = df["Name"].str.extract(_TITLE_RE, expand=False)
         
-        # Label Encoding: Mr=0, Ms=1, Mrs=2, Master=3, Royal=4, Rare=5
-        title_label_map = {
-            'Mr': 0,
-            'Ms': 1,
-            'Mrs': 2,
-            'Master': 3,
-            'Royal': 4,
-            'Rare': 5
-        }
-        df["Title"] = df["Title"].map(title_label_map).astype(int)
+        # 타이틀 정리, 그룹화 및 Label Encoding을 하나의 매핑으로 처리
+        # 매핑되지 않는 희소한 타이틀(및 결측치)은 "Rare"(5)로 묶기
+        df["Title"] = df["Title"].map(TITLE_LABEL_MAP).fillna(TITLE_RARE).astype(int)
         
         return df
\ No newline at end of file
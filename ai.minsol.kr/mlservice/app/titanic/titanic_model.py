@@ -1,7 +1,6 @@
 from multiprocessing.process import parent_process
 import pandas as pd
 import os
-from icecream import ic
 
 
 
@@ -1,59 +1,124 @@
 """
 타이타닉 관련 라우터
 """
-from fastapi import APIRouter, HTTPException, Query, Body
+from fastapi import APIRouter, HTTPException, Query, Body, Depends, FastAPI, Request
 from typing import List, Dict, Any, Optional
-from pathlib import Path
-import sys
+import asyncio
 import logging
-
-# 공통 모듈 경로 추가
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+from pydantic import BaseModel, ConfigDict, Field
+from starlette.concurrency import run_in_threadpool
 
 from app.titanic.titanic_service import TitanicService
+from app.titanic.titanic_batcher import PredictBatcher
+from common.utils import create_response, create_error_response, setup_logging
 
-# common 모듈 import 시도
-try:
-    from common.utils import create_response, create_error_response, setup_logging
-except ImportError:
-    # common 모듈이 없을 경우 기본 함수 정의
-    import logging
-    def setup_logging(name: str):
-        return logging.getLogger(name)
-    def create_response(data: Any, message: str = "Success", status: str = "success") -> Dict:
-        from datetime import datetime
-        return {
-            "status": status,
-            "message": message,
-            "data": data,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    def create_error_response(message: str, error_code: str = "UNKNOWN_ERROR") -> Dict:
-        from datetime import datetime
-        return {
-            "status": "error",
-            "message": message,
-            "error_code": error_code,
-            "timestamp": datetime.utcnow().isoformat()
+
+# Pydantic 모델 정의
+class PassengerData(BaseModel):
+    """승객 정보 모델 (train.csv / test.csv 컬럼 기준)"""
+    PassengerId: Optional[int] = Field(default=None, description="승객 ID")
+    Pclass: int = Field(..., ge=1, le=3, description="객실 등급 (1, 2, 3)")
+    Name: str = Field(..., description="이름 (예: 'Braund, Mr. Owen Harris')")
+    Sex: str = Field(..., description="성별 (male, female)")
+    Age: Optional[float] = Field(default=None, ge=0, description="나이")
+    SibSp: int = Field(default=0, ge=0, description="함께 탑승한 형제자매/배우자 수")
+    Parch: int = Field(default=0, ge=0, description="함께 탑승한 부모/자녀 수")
+    Ticket: Optional[str] = Field(default=None, description="티켓 번호")
+    Fare: Optional[float] = Field(default=None, ge=0, description="요금")
+    Cabin: Optional[str] = Field(default=None, description="객실 번호")
+    Embarked: Optional[str] = Field(default=None, description="탑승 항구 (S, C, Q)")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "PassengerId": 892,
+                "Pclass": 3,
+                "Name": "Kelly, Mr. James",
+                "Sex": "male",
+                "Age": 34.5,
+                "SibSp": 0,
+                "Parch": 0,
+                "Ticket": "330911",
+                "Fare": 7.8292,
+                "Cabin": None,
+                "Embarked": "Q"
+            }
         }
+    )
+
 
 # Logger 초기화
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/titanic", tags=["titanic"])
 
-# 서비스 인스턴스 생성 (싱글톤 패턴)
-_service_instance: Optional[TitanicService] = None
+def _create_service() -> TitanicService:
+    """TitanicService 생성 및 저장된 모델 로드 (모델 로드/예측기 컴파일은 블로킹 작업)"""
+    service = TitanicService()
+    try:
+        # 첫 예측 요청의 모델 로딩 지연 방지
+        service.load_model()
+    except Exception as e:
+        logger.warning(f"저장된 모델 로드 실패: {str(e)}")
+    return service
+
+
+async def init_service(app: FastAPI) -> TitanicService:
+    """앱 lifespan 시작 시 TitanicService를 워커당 한 번 생성하고 저장된 모델을 미리 로드"""
+    logger.info("TitanicService 인스턴스 생성 중...")
+    # 모델 로드와 treelite 컴파일이 이벤트 루프를 막지 않도록 스레드에서 실행
+    service = await asyncio.to_thread(_create_service)
+    app.state.titanic = service
+    # 동시에 들어온 /predict 요청을 묶어서 처리하는 배처 (lifespan의 이벤트 루프에서 시작)
+    app.state.titanic_batcher = PredictBatcher(service)
+    app.state.titanic_batcher.start()
+    logger.info("TitanicService 인스턴스 생성 완료")
+    return service
+
+
+async def shutdown_service(app: FastAPI):
+    """앱 lifespan 종료 시 예측 배처 워커 정리"""
+    batcher = getattr(app.state, 'titanic_batcher', None)
+    if batcher is not None:
+        await batcher.stop()
+
+
+def get_service(request: Request) -> TitanicService:
+    """lifespan에서 생성한 TitanicService 인스턴스 반환 (Depends로 주입)"""
+    return request.app.state.titanic
+
+
+def get_batcher(request: Request) -> PredictBatcher:
+    """lifespan에서 생성한 예측 배처 반환 (Depends로 주입)"""
+    return request.app.state.titanic_batcher
+
+
+# 전처리/학습/평가/제출은 서비스 상태(X_train, models 등)를 바꾸므로 한 번에 하나만 실행
+_training_lock = asyncio.Lock()
+
 
+async def _run_blocking(func, *args):
+    """CPU 작업을 스레드 풀에서 실행하여 이벤트 루프(예측/헬스체크 요청)를 막지 않음"""
+    async with _training_lock:
+        return await run_in_threadpool(func, *args)
 
-def get_service() -> TitanicService:
-    """TitanicService 싱글톤 인스턴스 반환"""
-    global _service_instance
-    if _service_instance is None:
-        logger.info("TitanicService 인스턴스 생성 중...")
-        _service_instance = TitanicService()
-        logger.info("TitanicService 인스턴스 생성 완료")
-    return _service_instance
+
+async def _predict(service: TitanicService, passengers: List[PassengerData]) -> List[Dict[str, Any]]:
+    """CPU 작업인 예측을 스레드 풀에서 실행하여 이벤트 루프를 막지 않음"""
+    records = [p.model_dump() for p in passengers]
+    loop = asyncio.get_running_loop()
+    predictions = await loop.run_in_executor(None, service.predict_records, records)
+    return [
+        {"PassengerId": p.PassengerId, "Survived": int(pred)}
+        for p, pred in zip(passengers, predictions)
+    ]
+
+
+def _model_not_ready_response() -> Dict:
+    return create_response(
+        data={"message": "학습된 모델이 없습니다. 먼저 /submit을 실행해주세요."},
+        message="Model not trained"
+    )
 
 
 @router.get("/")
@@ -81,12 +146,13 @@ async def get_passengers(limit: int = Query(default=10, ge=1, le=100, descriptio
 
 
 @router.get("/statistics")
-async def get_statistics():
+async def get_statistics(service: TitanicService = Depends(get_service)):
     """데이터 통계 정보 조회"""
     try:
+        # 첫 호출은 train.csv를 읽으므로 스레드 풀에서 실행 (이후에는 캐시된 결과)
         return create_response(
-            data={"message": "이 기능은 아직 구현되지 않았습니다."},
-            message="Statistics endpoint is not yet implemented"
+            data=await run_in_threadpool(service.get_data_info),
+            message="Statistics retrieved"
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get statistics: {str(e)}")
@@ -96,12 +162,12 @@ async def get_statistics():
 async def train_model(
     test_size: float = Body(default=0.2, ge=0.1, le=0.5, description="테스트 데이터 비율"),
     random_state: int = Body(default=42, description="랜덤 시드"),
-    n_estimators: int = Body(default=100, ge=10, le=1000, description="랜덤 포레스트 트리 개수")
+    n_estimators: int = Body(default=100, ge=10, le=1000, description="랜덤 포레스트 트리 개수"),
+    service: TitanicService = Depends(get_service)
 ):
     """머신러닝 모델 훈련"""
     try:
-        service = get_service()
-        service.learning()
+        await _run_blocking(service.learning)
         return create_response(
             data={"message": "학습이 완료되었습니다. (터미널 로그 확인)"},
             message="Model training completed"
@@ -111,39 +177,53 @@ async def train_model(
 
 
 @router.post("/predict")
-async def predict_survival(passenger_data: Dict[str, Any] = Body(..., description="승객 정보")):
-    """승객 생존 예측"""
+async def predict_survival(
+    passenger_data: PassengerData = Body(..., description="승객 정보"),
+    service: TitanicService = Depends(get_service),
+    batcher: PredictBatcher = Depends(get_batcher)
+):
+    """승객 생존 예측 (동시 요청은 배처에서 한 번의 모델 호출로 묶어 처리)"""
     try:
+        if service.best_model is None:
+            return _model_not_ready_response()
+        survived = await batcher.predict(passenger_data.model_dump())
         return create_response(
-            data={"message": "이 기능은 아직 구현되지 않았습니다."},
-            message="Prediction endpoint is not yet implemented"
+            data={"PassengerId": passenger_data.PassengerId, "Survived": survived, "model": service.best_model_name},
+            message="Prediction completed"
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to predict: {str(e)}")
 
 
 @router.post("/predict-batch")
-async def predict_batch(passengers_data: List[Dict[str, Any]] = Body(..., description="승객 정보 리스트")):
+async def predict_batch(
+    passengers_data: List[PassengerData] = Body(..., description="승객 정보 리스트"),
+    service: TitanicService = Depends(get_service)
+):
     """여러 승객 생존 예측 (배치)"""
     try:
+        if service.best_model is None:
+            return _model_not_ready_response()
+        if not passengers_data:
+            return create_response(data={"results": [], "total": 0}, message="Batch prediction completed")
+        results = await _predict(service, passengers_data)
         return create_response(
-            data={"message": "이 기능은 아직 구현되지 않았습니다."},
-            message="Batch prediction endpoint is not yet implemented"
+            data={"results": results, "total": len(results), "model": service.best_model_name},
+            message="Batch prediction completed"
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to predict batch: {str(e)}")
 
 
 @router.get("/preprocess")
-async def preprocess_data():
+async def preprocess_data(service: TitanicService = Depends(get_service)):
     """데이터 전처리"""
     try:
         logger.info("=" * 50)
         logger.info("전처리 요청 수신")
         logger.info("=" * 50)
-        service = get_service()
         logger.info("서비스 인스턴스 획득 완료, preprocess() 호출 시작")
-        service.preprocess()
+        await _run_blocking(service.preprocess)
         logger.info("전처리 완료")
         return create_response(
             data={"message": "전처리가 완료되었습니다. (터미널 로그 확인)"},
@@ -178,13 +258,12 @@ async def get_model_status():
         raise HTTPException(status_code=500, detail=f"Failed to get model status: {str(e)}")
 
 @router.get("/evaluate")
-async def evaluate_model():
+async def evaluate_model(service: TitanicService = Depends(get_service)):
     """
     모델 평가 실행
     - 실행 후 모델 평가 결과 반환
     """
     try:
-        service = get_service()
         
         # 전처리 확인
         if service.X_train is None:
@@ -193,12 +272,14 @@ async def evaluate_model():
                 message="Preprocessing required"
             )
         
-        # 모델링 및 학습
-        service.modeling()
-        service.learning()
-        
-        # 평가 실행
-        results = service.evaluate()
+        def _modeling_and_evaluate():
+            # 모델링 및 학습
+            service.modeling()
+            service.learning()
+            # 평가 실행
+            return service.evaluate()
+
+        results = await _run_blocking(_modeling_and_evaluate)
         
         # 결과 반환
         return create_response(
@@ -215,16 +296,20 @@ async def evaluate_model():
 
 
 @router.get("/submit")
-async def submit_model():
+async def submit_model(
+    force_retrain: bool = Query(default=False, description="저장된 최고 모델을 무시하고 재학습"),
+    refit_on_full: bool = Query(default=True, description="최고 모델을 전체 train 데이터로 재학습 (false면 평가 시 학습된 모델 사용)"),
+    service: TitanicService = Depends(get_service)
+):
     """
     캐글 제출용 파일 생성
+    - 저장된 최고 모델이 있으면 재사용 (force_retrain=true 시 재학습)
     - 모델 평가를 통해 최고 성능 모델 선택
     - 전체 train 데이터로 재학습
     - test 데이터 예측 및 submission.csv 생성
     - 모델 파일 및 결과 요약 저장
     """
     try:
-        service = get_service()
         
         # 전처리 확인
         if service.X_train is None:
@@ -233,13 +318,15 @@ async def submit_model():
                 message="Preprocessing required"
             )
         
-        # 모델이 없으면 모델링 및 학습
-        if not service.models:
-            service.modeling()
-            service.learning()
-        
-        # 제출 실행
-        result = service.submit()
+        def _train_and_submit():
+            # 재학습이 필요한데 모델이 없으면 모델링 및 학습
+            if not service.models and (force_retrain or not service.has_cached_model()):
+                service.modeling()
+                service.learning()
+            # 제출 실행
+            return service.submit(force_retrain=force_retrain, refit_on_full=refit_on_full)
+
+        result = await _run_blocking(_train_and_submit)
         
         if result is None:
             return create_response(
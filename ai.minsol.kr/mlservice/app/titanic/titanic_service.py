@@ -2,23 +2,86 @@
 타이타닉 데이터 서비스
 판다스, 넘파이, 사이킷런을 사용한 데이터 처리 및 머신러닝 서비스
 """
+import os
 import sys
+import gc
+import copy
+import hashlib
 import logging
 from pathlib import Path
-from typing import List, Dict, Optional, Any, ParamSpecArgs
+from typing import List, Dict, Optional, Any, ParamSpecArgs, Tuple
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from sklearn.model_selection import StratifiedShuffleSplit
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.naive_bayes import GaussianNB
-from sklearn.svm import SVC
+from sklearn.svm import LinearSVC
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 import joblib
-from app.titanic.titanic_method import TitanicMethod
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from app.titanic.titanic_method import (
+    TitanicMethod,
+    AGE_BIN_EDGES,
+    ORDINAL_COLUMNS,
+    PREPROCESS_COLUMNS,
+    CSV_DTYPES,
+    EMBARKED_LABEL_MAP,
+    TITLE_LABEL_MAP,
+    TITLE_RARE,
+    _TITLE_RE,
+)
 from app.titanic.titanic_dataset import TitanicDataSet
 
+# 모델 입력 피처 컬럼 순서 (예측 시 동일한 순서로 행렬 구성)
+# PassengerId는 제출 파일용으로만 유지하고 피처에서는 제외 (중복 행 제거가 가능하도록)
+FEATURE_COLUMNS = ['Pclass', 'Age', 'Fare', 'Embarked', 'Gender', 'Title']
+# 전처리 로직(구간화/인코딩 방식)을 바꾸면 올려서 기존 parquet 캐시를 무효화
+PREPROCESS_VERSION = 1
+# 모델 파일 압축 방식 (lz4가 없으면 표준 라이브러리 zlib 사용)
+try:
+    import lz4  # noqa: F401
+    MODEL_COMPRESS = ('lz4', 3)
+except ImportError:
+    MODEL_COMPRESS = ('zlib', 3)
+
+# 피처 행 -> 예측 결과 메모리 캐시 최대 크기 (초과 시 비움)
+PREDICTION_CACHE_SIZE = 10000
+
+# 중복 행을 합쳐 sample_weight로 학습해도 원본 학습과 목적 함수가 같은 모델
+# (랜덤포레스트의 부트스트랩, LightGBM의 min_child_samples 등은 고유 행 수 기준이 되어 결과가 달라지므로 제외)
+WEIGHTED_DEDUP_MODELS = frozenset({'logistic_regression', 'naive_bayes', 'svm'})
+
+
+def _deduplicate(X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    구간화된 피처 공간에서 (피처, 라벨)이 같은 행을 하나로 합치고 등장 횟수를 가중치로 반환
+    - 라벨이 다른 행은 합치지 않음. 가중치 학습이 원본 학습과 같은 모델(WEIGHTED_DEDUP_MODELS)에만 사용
+    """
+    rows, counts = np.unique(np.column_stack([X, y]).astype(np.float32), axis=0, return_counts=True)
+    return np.ascontiguousarray(rows[:, :-1]), rows[:, -1].astype(np.asarray(y).dtype), counts.astype(np.float64)
+
+
+def _fit_weighted(model, X: np.ndarray, y: np.ndarray, sample_weight: Optional[np.ndarray]):
+    """sample_weight가 있을 때만 전달하여 학습 (가중치를 지원하지 않는 cuML 모델 대응)"""
+    if sample_weight is None:
+        return model.fit(X, y)
+    return model.fit(X, y, sample_weight=sample_weight)
+
+
+def _fit_eval(model_name, model, X_train, y_train, sample_weight, X_val, y_val):
+    """모델 하나를 학습/검증 (joblib 워커 프로세스에서 실행되도록 모듈 레벨에 정의)"""
+    m = clone(model)
+    # 모델 단위로 병렬 실행하므로 모델 내부 병렬화는 끔 (코어 과다 할당 방지)
+    if 'n_jobs' in m.get_params():
+        m.set_params(n_jobs=1)
+    _fit_weighted(m, X_train, y_train, sample_weight)
+    return model_name, m, accuracy_score(y_val, m.predict(X_val))
+
+
 class TitanicService:
     """타이타닉 데이터 처리 및 머신러닝 서비스"""
     
@@ -37,84 +100,408 @@ class TitanicService:
         self.X_train = None
         self.X_test = None
         self.y_train = None
+        # 모델 입력용 float32 C-contiguous 피처 행렬 (전처리 시 한 번만 생성)
+        self.X_train_np = None
+        self.X_test_np = None
+        self.y_train_np = None
+        # evaluate()용 train/validation 분할 인덱스 (전처리 결과가 바뀔 때만 재계산)
+        self._split_idx = None
         # 모델 저장
         self.models = {}
+        # cuML(GPU) 모델 사용 여부 (modeling()에서 결정)
+        self.use_gpu = False
+        # 예측용 최고 성능 모델 (submit() 또는 load_model()로 설정)
+        self.download_dir = (Path(__file__).parent.parent / 'download').resolve()
+        self.best_model = None
+        self.best_model_name = None
+        self.best_accuracy = None
+        # 모델별 검증 정확도 (model_summary.txt 작성용)
+        self.best_results = None
+        # (모델, 모델 이름, 정확도, 평가 결과)를 함께 저장하는 최고 모델 캐시
+        self.model_cache_path = self.download_dir / 'best_model.joblib'
+        # 전처리 결과(parquet) 캐시 폴더
+        self.cache_dir = self.download_dir / 'cache'
+        # treelite로 컴파일된 랜덤포레스트 예측기 (설치된 경우에만 사용)
+        self.compiled_predictor = None
+        # 예측 시 결측치/구간화에 사용할 train 통계
+        self.inference_stats = None
+        # 동일한 피처 행에 대한 예측 결과 캐시 (모델이 바뀌면 초기화)
+        self._prediction_cache = {}
+        # train 데이터 통계 (train.csv는 런타임에 바뀌지 않으므로 한 번만 계산)
+        self._data_info = None
+
+    def _preprocess_cache_paths(self) -> Tuple[Path, Path]:
+        """
+        전처리 캐시(parquet) 경로 반환
+        - 입력 CSV 파일의 수정 시각(mtime)/크기와 전처리 버전 및 피처/구간화 상수를 해시한 키 사용
+          (상수나 전처리 로직이 바뀌면 이전 캐시를 사용하지 않음)
+        """
+        train_stat = self.train_csv_path.stat()
+        test_stat = self.test_csv_path.stat()
+        preprocess_spec = repr((
+            PREPROCESS_VERSION, PREPROCESS_COLUMNS, ORDINAL_COLUMNS, FEATURE_COLUMNS, CSV_DTYPES,
+            AGE_BIN_EDGES.tolist(), EMBARKED_LABEL_MAP, TITLE_LABEL_MAP, TITLE_RARE, _TITLE_RE.pattern,
+        ))
+        fingerprint = (
+            f"{train_stat.st_mtime_ns}:{train_stat.st_size}:{test_stat.st_mtime_ns}:{test_stat.st_size}:"
+            f"{preprocess_spec}"
+        )
+        key = hashlib.md5(fingerprint.encode()).hexdigest()[:12]
+        return (
+            self.cache_dir / f"train_{key}.parquet",
+            self.cache_dir / f"test_{key}.parquet",
+        )
+
+    def _set_preprocessed(self, this_train: pd.DataFrame, this_test: pd.DataFrame, y_train: pd.Series):
+        """전처리 결과를 서비스 상태에 반영"""
+        this = TitanicDataSet()
+        this.train = this_train
+        this.test = this_test
+        self.dataset = this
+        # 전처리된 train 데이터를 feature로 사용
+        self.X_train = this_train
+        self.X_test = this_test
+        self.y_train = y_train
+        # 예측 시마다 float64 변환/할당이 일어나지 않도록 float32 행렬을 미리 캐시
+        # (test도 train과 동일한 피처 순서로 구성)
+        self.X_train_np = self._to_feature_matrix(this_train, FEATURE_COLUMNS)
+        self.X_test_np = self._to_feature_matrix(this_test, FEATURE_COLUMNS)
+        self.y_train_np = y_train.to_numpy(dtype=np.int8)
+        self._split_idx = None
+
+    @staticmethod
+    def _to_feature_matrix(df: pd.DataFrame, columns: List[str]) -> np.ndarray:
+        """컬럼별 float32 배열을 한 번에 쌓아 C-contiguous (행 우선) 피처 행렬 생성"""
+        return np.column_stack([df[col].to_numpy(dtype=np.float32) for col in columns])
 
     def preprocess(self):
         self.logger.info("❤️❤️ Train 전처리 시작") 
         self.logger.info(f"Train CSV 경로: {self.train_csv_path}")
         self.logger.info(f"Test CSV 경로: {self.test_csv_path}")
         
+        # 입력 CSV가 바뀌지 않았다면 캐시된 전처리 결과 사용
+        train_cache_path, test_cache_path = self._preprocess_cache_paths()
+        if train_cache_path.exists() and test_cache_path.exists():
+            try:
+                cached_train = pd.read_parquet(train_cache_path, engine='pyarrow')
+                cached_test = pd.read_parquet(test_cache_path, engine='pyarrow')
+                y_train = cached_train.pop('Survived')
+                self._set_preprocessed(cached_train, cached_test, y_train)
+                self.logger.info(f"전처리 캐시 사용: {train_cache_path.name}, {test_cache_path.name}")
+                return
+            except Exception as e:
+                self.logger.warning(f"전처리 캐시 로드 실패, 전체 전처리를 수행합니다: {str(e)}")
+        
         try:
             the_method = TitanicMethod()
-            df_train = the_method.read_csv(str(self.train_csv_path))
-            df_test = the_method.read_csv(str(self.test_csv_path))
+            df_train = the_method.read_csv(
+                str(self.train_csv_path),
+                dtype={**CSV_DTYPES, 'Survived': 'int8'},
+                usecols=PREPROCESS_COLUMNS + ['Survived']
+            )
+            df_test = the_method.read_csv(str(self.test_csv_path), usecols=PREPROCESS_COLUMNS)
         except FileNotFoundError as e:
             self.logger.error(f"CSV 파일을 찾을 수 없습니다: {str(e)}")
             raise
         except Exception as e:
             self.logger.error(f"CSV 파일 읽기 오류: {str(e)}")
             raise
+        # label은 첫 번째 읽기에서 바로 분리 (train.csv를 다시 읽지 않음)
+        y_train = df_train['Survived']
         this_train = the_method.create_df(df_train, 'Survived')
+        del df_train
 
-        # test 데이터에는 Survived 컬럼이 없으므로 그대로 사용
-        this_test = df_test.copy()
-        self.logger.info(f'1. Train 의 type \n {type(this_train)} ')
-        self.logger.info(f'2. Train 의 column \n {this_train.columns} ')
-        self.logger.info(f'3. Train 의 상위 5개 행\n {this_train.head(5)} ')
-        self.logger.info(f'4. Train 의 null 의 갯수\n {int(this_train.isnull().sum().sum())}개')
+        # test 데이터에는 Survived 컬럼이 없으므로 복사 없이 그대로 사용
         self.logger.info("💙💙 Test 전처리 시작")
-        # test 데이터에는 Survived 컬럼이 없으므로 그대로 사용
-        self.logger.info(f'1. Test 의 type \n {type(this_test)}')
-        self.logger.info(f'2. Test 의 column \n {this_test.columns}')
-        self.logger.info(f'3. Test 의 상위 5개 행\n {this_test.head(5)}')
-        self.logger.info(f'4. Test 의 null 의 갯수\n {int(this_test.isnull().sum().sum())}개')
-
-        this = TitanicDataSet()
-        this.train = this_train
-        this.test = this_test
-
-        drop_features = ['SibSp', 'Parch', 'Cabin', 'Ticket']
-        this = the_method.drop_feature(this, *drop_features)
-        this.train = the_method.pclass_ordinal(this.train)
-        this.test = the_method.pclass_ordinal(this.test)
-        this.train = the_method.gender_nominal(this.train)
-        this.test = the_method.gender_nominal(this.test)
-        this.train = the_method.age_ratio(this.train)
-        this.test = the_method.age_ratio(this.test)
-        this.train = the_method.fare_ordinal(this.train)
-        this.test = the_method.fare_ordinal(this.test)
-        this.train = the_method.embarked_ordinal(this.train)
-        this.test = the_method.embarked_ordinal(this.test)
-        this.train = the_method.title_nominal(this.train)
-        this.test = the_method.title_nominal(this.test)
-        drop_name = ['Name']
-        this = the_method.drop_feature(this, *drop_name)
-        
-        # this 객체에서 다시 변수로 할당
-        this_train = this.train
-        this_test = this.test
+        
+        # train/test를 결합해 변환 메서드를 한 번씩만 호출
+        # (결측치와 Fare 구간 경계는 예측 시와 동일하게 train 통계 사용)
+        n_train = len(this_train)
+        embarked_mode = this_train['Embarked'].mode()
+        fill_values = {
+            'Age': this_train['Age'].median(),
+            'Fare': this_train['Fare'].median(),
+            'Embarked': embarked_mode[0] if not embarked_mode.empty else 'S',
+        }
+        combined = pd.concat([this_train, df_test], ignore_index=True).fillna(fill_values)
+        # 원본 프레임은 더 이상 필요 없으므로 결합 직후 해제
+        del this_train, df_test
+        fare_edges = np.quantile(combined['Fare'].to_numpy(dtype=np.float64)[:n_train], [0.25, 0.5, 0.75])
+        the_method.fare_edges = fare_edges
+        
+        combined = the_method.pclass_ordinal(combined)
+        combined = the_method.gender_nominal(combined)
+        combined = the_method.age_ratio(combined)
+        combined = the_method.fare_ordinal(combined, edges=fare_edges)
+        combined = the_method.embarked_ordinal(combined)
+        combined = the_method.title_nominal(combined)
+        combined.drop(columns=['Name'], inplace=True)
+        combined = combined.astype({col: 'int8' for col in ORDINAL_COLUMNS})
+        
+        this_train = combined.iloc[:n_train].reset_index(drop=True)
+        this_test = combined.iloc[n_train:].reset_index(drop=True)
+        del combined
 
         self.logger.info("❤️❤️ Train 전처리 완료")
-        self.logger.info(f'1. Train 의 type \n {type(this_train)} ')
-        self.logger.info(f'2. Train 의 column \n {this_train.columns} ')
-        self.logger.info(f'3. Train 의 상위 5개 행\n {this_train.head(5)} ')
-        self.logger.info(f'4. Train 의 null 의 갯수\n {int(this_train.isnull().sum().sum())}개')
         self.logger.info("💙💙 Test 전처리 완료")
-        self.logger.info(f'1. Test 의 type \n {type(this_test)} ')
-        self.logger.info(f'2. Test 의 column \n {this_test.columns} ')
-        self.logger.info(f'3. Test 의 상위 5개 행\n {this_test.head(5)} ')
-        self.logger.info(f'4. Test 의 null 의 갯수\n {int(this_test.isnull().sum().sum())}개')
+        # 결과 요약은 로그 레벨이 켜져 있을 때만 계산 (DataFrame 문자열화/null 스캔 생략)
+        if self.logger.isEnabledFor(logging.INFO):
+            for label, df in (('Train', this_train), ('Test', this_test)):
+                self.logger.info("%s 의 column: %s", label, list(df.columns))
+                self.logger.info("%s 의 null 의 갯수: %d개", label, int(df.isnull().sum().sum()))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Train 의 상위 5개 행\n%r", this_train.head(5))
+            self.logger.debug("Test 의 상위 5개 행\n%r", this_test.head(5))
         
         # 전처리된 데이터 저장
-        self.dataset = this
-        # 원본 train 데이터에서 label 추출
-        df_train_original = the_method.read_csv(str(self.train_csv_path))
-        y_train = df_train_original['Survived']
-        # 전처리된 train 데이터를 feature로 사용
-        self.X_train = this_train
-        self.X_test = this_test
-        self.y_train = y_train
+        self._set_preprocessed(this_train, this_test, y_train)
+        self._save_preprocess_cache(train_cache_path, test_cache_path)
+        # 변환 중 생긴 임시 DataFrame 메모리를 한 번에 회수
+        gc.collect()
+
+    def _save_preprocess_cache(self, train_cache_path: Path, test_cache_path: Path):
+        """전처리 결과를 parquet(zstd)으로 저장하고 이전 캐시 파일은 삭제"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for pattern in ('train_*.parquet', 'test_*.parquet'):
+                for stale in self.cache_dir.glob(pattern):
+                    if stale not in (train_cache_path, test_cache_path):
+                        stale.unlink()
+            self.X_train.assign(Survived=self.y_train.values).to_parquet(
+                train_cache_path, engine='pyarrow', compression='zstd', index=False
+            )
+            self.X_test.to_parquet(test_cache_path, engine='pyarrow', compression='zstd', index=False)
+            self.logger.info(f"전처리 캐시 저장 완료: {train_cache_path.name}, {test_cache_path.name}")
+        except Exception as e:
+            # 캐시 저장 실패는 전처리 결과에 영향을 주지 않음
+            self.logger.warning(f"전처리 캐시 저장 실패: {str(e)}")
+
+    def get_data_info(self) -> Dict[str, Any]:
+        """train 데이터 기본 정보 및 수치형 컬럼 통계 (첫 호출 시 한 번 계산 후 재사용)"""
+        if self._data_info is None:
+            self._data_info = self._compute_data_info()
+        return self._data_info
+
+    def _compute_data_info(self) -> Dict[str, Any]:
+        """train 데이터 기본 정보 및 수치형 컬럼 통계 (describe() 대신 NumPy로 한 번에 계산)"""
+        df = TitanicMethod().read_csv(str(self.train_csv_path))
+        numeric = df.select_dtypes(include=[np.number])
+        arr = numeric.to_numpy(dtype=np.float64)
+        
+        counts = np.count_nonzero(~np.isnan(arr), axis=0)
+        means = np.nanmean(arr, axis=0)
+        stds = np.nanstd(arr, axis=0, ddof=1)  # describe()와 동일한 표본 표준편차
+        percentiles = np.nanpercentile(arr, [0, 25, 50, 75, 100], axis=0)
+        
+        statistics = {}
+        for j, col in enumerate(numeric.columns):
+            statistics[col] = {
+                'count': int(counts[j]),
+                'mean': float(means[j]),
+                'std': float(stds[j]),
+                'min': float(percentiles[0, j]),
+                '25%': float(percentiles[1, j]),
+                '50%': float(percentiles[2, j]),
+                '75%': float(percentiles[3, j]),
+                'max': float(percentiles[4, j]),
+            }
+        
+        return {
+            'rows': len(df),
+            'columns': df.columns.tolist(),
+            'statistics': statistics,
+        }
+
+    def _fit_inference_stats(self) -> Dict[str, Any]:
+        """예측 입력 전처리에 사용할 train 데이터 통계 계산"""
+        df_train = TitanicMethod().read_csv(str(self.train_csv_path))
+        fares = df_train['Fare'].fillna(df_train['Fare'].median()).to_numpy(dtype=np.float64)
+        embarked_mode = df_train['Embarked'].mode()
+        return {
+            'age_median': float(df_train['Age'].median()),
+            'fare_median': float(df_train['Fare'].median()),
+            'embarked_mode': embarked_mode[0] if not embarked_mode.empty else 'S',
+            # fare_ordinal의 사분위수 구간 경계
+            'fare_edges': np.quantile(fares, [0.25, 0.5, 0.75]),
+        }
+
+    def _set_best_model(self, model, model_name: str):
+        """예측용 모델 설정 (단건 예측에서는 스레드 생성 비용을 피하기 위해 n_jobs=1)"""
+        if 'n_jobs' in model.get_params():
+            # 학습용 모델(self.models)의 n_jobs 설정은 유지하도록 얕은 복사본에만 적용
+            model = copy.copy(model)
+            model.set_params(n_jobs=1)
+        self.best_model = model
+        self.best_model_name = model_name
+        self._prediction_cache = {}
+        self._compile_predictor(model)
+        if self.inference_stats is None:
+            self.inference_stats = self._fit_inference_stats()
+
+    def _compile_predictor(self, model):
+        """랜덤포레스트를 treelite/tl2cgen으로 네이티브 코드로 컴파일 (저지연 단건 예측용)"""
+        self.compiled_predictor = None
+        if not isinstance(model, RandomForestClassifier):
+            return
+        
+        # treelite가 사용 가능한 경우에만 컴파일 (지연 import)
+        try:
+            import treelite
+            import tl2cgen
+        except (ImportError, OSError) as e:
+            self.logger.info(f"treelite를 사용할 수 없어 scikit-learn 예측을 사용합니다: {str(e)}")
+            return
+        
+        try:
+            self.download_dir.mkdir(parents=True, exist_ok=True)
+            # 모델 내용 해시를 파일명에 넣어 같은 모델이면 재시작 시 컴파일된 라이브러리 재사용
+            libpath = self.download_dir / f'random_forest_predictor_{joblib.hash(model)[:16]}.so'
+            if libpath.exists():
+                self.compiled_predictor = tl2cgen.Predictor(str(libpath))
+                self.logger.info(f"컴파일된 랜덤포레스트 재사용: {libpath}")
+                return
+            tl_model = treelite.sklearn.import_model(model)
+            # 여러 워커가 동시에 컴파일해도 완성된 파일만 보이도록 임시 파일에 쓴 뒤 원자적으로 이동
+            tmp_libpath = libpath.with_name(f'{libpath.stem}.{os.getpid()}.tmp.so')
+            tl2cgen.export_lib(tl_model, toolchain='gcc', libpath=str(tmp_libpath), params={'parallel_comp': 8})
+            os.replace(tmp_libpath, libpath)
+            self.compiled_predictor = tl2cgen.Predictor(str(libpath))
+            self.logger.info(f"랜덤포레스트 컴파일 완료: {libpath}")
+            # 이전 모델용 라이브러리 정리 (다른 워커가 쓰는 중인 임시 파일은 제외)
+            for old_lib in self.download_dir.glob('random_forest_predictor_*.so'):
+                if old_lib != libpath and not old_lib.name.endswith('.tmp.so'):
+                    old_lib.unlink(missing_ok=True)
+        except Exception as e:
+            self.logger.warning(f"랜덤포레스트 컴파일 실패, scikit-learn 예측을 사용합니다: {str(e)}")
+
+    def _predict_matrix(self, X: np.ndarray) -> np.ndarray:
+        """피처 행렬 예측 (컴파일된 예측기가 있으면 우선 사용)"""
+        if self.compiled_predictor is None:
+            return self.best_model.predict(X)
+        
+        import tl2cgen
+        # 클래스별 확률 출력을 (샘플 수, 클래스 수)로 펼친 뒤 argmax
+        probs = np.asarray(self.compiled_predictor.predict(tl2cgen.DMatrix(X))).reshape(X.shape[0], -1)
+        if probs.shape[1] > 1:
+            idx = probs.argmax(axis=1)
+        else:
+            idx = (probs[:, 0] > 0.5).astype(np.intp)
+        return self.best_model.classes_[idx]
+
+    @staticmethod
+    def _is_compatible(model) -> bool:
+        """현재 피처 구성(FEATURE_COLUMNS)으로 학습된 모델인지 확인"""
+        return getattr(model, 'n_features_in_', len(FEATURE_COLUMNS)) == len(FEATURE_COLUMNS)
+
+    def load_model(self) -> bool:
+        """download 폴더에 저장된 최고 모델 캐시(없으면 최신 모델 파일)를 메모리에 로드"""
+        if self.model_cache_path.exists():
+            best_model, model_name, accuracy, results = joblib.load(self.model_cache_path)
+            if not self._is_compatible(best_model):
+                # 피처 구성이 바뀌기 전에 저장된 캐시는 재사용할 수 없으므로 삭제
+                self.logger.warning(f"피처 구성이 달라 모델 캐시를 삭제합니다: {self.model_cache_path}")
+                self.model_cache_path.unlink()
+                return False
+            self._set_best_model(best_model, model_name)
+            self.best_accuracy = accuracy
+            self.best_results = results
+            self.logger.info(f"모델 캐시 로드 완료: {self.model_cache_path} ({model_name}, 정확도: {accuracy:.4f})")
+            return True
+        
+        model_files = sorted(self.download_dir.glob('*_model.pkl'), key=lambda p: p.stat().st_mtime)
+        if not model_files:
+            self.logger.info(f"저장된 모델 파일이 없습니다: {self.download_dir}")
+            return False
+        model_path = model_files[-1]
+        model_name = model_path.name[:-len('_model.pkl')]
+        model = joblib.load(model_path)
+        if not self._is_compatible(model):
+            self.logger.warning(f"피처 구성이 달라 모델 파일을 사용하지 않습니다: {model_path}")
+            return False
+        self._set_best_model(model, model_name)
+        self.logger.info(f"모델 로드 완료: {model_path}")
+        return True
+
+    def has_cached_model(self) -> bool:
+        """재학습 없이 submit()에 사용할 수 있는 최고 모델이 있는지 여부"""
+        return (self.best_model is not None and self.best_results is not None) or self.model_cache_path.exists()
+
+    def predict(self, passengers: pd.DataFrame) -> np.ndarray:
+        """
+        승객 정보로 생존 여부 예측
+        
+        Args:
+            passengers: 원본 CSV 형식의 승객 데이터 (호출자가 소유한 DataFrame, 직접 수정됨)
+            
+        Returns:
+            생존 예측 배열 (0: 사망, 1: 생존)
+        """
+        if self.best_model is None:
+            raise RuntimeError("학습된 모델이 없습니다. 먼저 /submit을 실행해주세요.")
+        
+        stats = self.inference_stats
+        df = passengers.fillna({
+            'PassengerId': 0,
+            'Age': stats['age_median'],
+            'Fare': stats['fare_median'],
+            'Embarked': stats['embarked_mode'],
+        })
+        
+        the_method = TitanicMethod()
+        df = the_method.pclass_ordinal(df)
+        df = the_method.gender_nominal(df)
+        df = the_method.age_ratio(df)
+        df = the_method.embarked_ordinal(df)
+        df = the_method.title_nominal(df)
+        # 입력 데이터의 분위수가 아닌 train 사분위수 경계로 구간화
+        df = the_method.fare_ordinal(df, edges=stats['fare_edges'])
+        
+        X = self._to_feature_matrix(df, FEATURE_COLUMNS)
+        return self._predict_matrix(X)
+
+    def predict_records(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        승객 레코드(dict) 리스트로 생존 여부 예측
+        - DataFrame을 만들지 않고 피처 행렬을 직접 채워 단건 예측의 할당 비용을 줄임
+        
+        Args:
+            records: 원본 CSV 컬럼명을 키로 갖는 승객 정보 리스트
+            
+        Returns:
+            생존 예측 배열 (0: 사망, 1: 생존)
+        """
+        if self.best_model is None:
+            raise RuntimeError("학습된 모델이 없습니다. 먼저 /submit을 실행해주세요.")
+        
+        stats = self.inference_stats
+        # 요청마다 새로 할당 (executor 스레드 간 버퍼 공유 방지)
+        X = np.empty((len(records), len(FEATURE_COLUMNS)), dtype=np.float32)
+        for i, r in enumerate(records):
+            age = r.get('Age')
+            fare = r.get('Fare')
+            embarked = r.get('Embarked') or stats['embarked_mode']
+            match = _TITLE_RE.search(r.get('Name') or '')
+            X[i, 0] = r['Pclass']
+            X[i, 1] = np.searchsorted(AGE_BIN_EDGES, stats['age_median'] if age is None else age, side='left')
+            X[i, 2] = np.searchsorted(stats['fare_edges'], stats['fare_median'] if fare is None else fare, side='left')
+            X[i, 3] = EMBARKED_LABEL_MAP.get(embarked, 0)
+            X[i, 4] = 1 if r.get('Sex') == 'female' else 0
+            X[i, 5] = TITLE_LABEL_MAP.get(match.group(1), TITLE_RARE) if match else TITLE_RARE
+        return self._cached_predict(X)
+
+    def _cached_predict(self, X: np.ndarray) -> np.ndarray:
+        """구간화된 피처 행이 같으면 이전 예측 결과 재사용 (캐시에 없는 행만 한 번에 예측)"""
+        cache = self._prediction_cache
+        keys = [row.tobytes() for row in X]
+        preds = [cache.get(key) for key in keys]
+        miss = [i for i, pred in enumerate(preds) if pred is None]
+        if miss:
+            if len(cache) + len(miss) > PREDICTION_CACHE_SIZE:
+                cache.clear()
+            for i, pred in zip(miss, self._predict_matrix(X[miss])):
+                preds[i] = pred
+                cache[keys[i]] = pred
+        return np.array(preds)
 
     def modeling(self):
         self.logger.info("🍀🍀 모델링 시작")
@@ -123,10 +510,26 @@ class TitanicService:
         self.models = {
             'logistic_regression': LogisticRegression(random_state=42, max_iter=1000),
             'naive_bayes': GaussianNB(),
-            'random_forest': RandomForestClassifier(n_estimators=100, random_state=42),
-            'svm': SVC(random_state=42, probability=True)
+            'random_forest': RandomForestClassifier(n_estimators=100, random_state=42, max_features='sqrt', n_jobs=-1),
+            # predict만 사용하므로 Platt scaling(probability=True)의 내부 5-fold 재학습이 없는 선형 SVM 사용
+            'svm': LinearSVC(C=1.0, dual='auto', random_state=42, max_iter=2000)
         }
         
+        # CUDA와 cuML이 사용 가능한 경우 GPU 모델로 교체 (지연 import)
+        self.use_gpu = False
+        try:
+            import cuml
+            self.models['logistic_regression'] = cuml.linear_model.LogisticRegression(max_iter=1000)
+            self.models['random_forest'] = cuml.ensemble.RandomForestClassifier(
+                n_estimators=100, random_state=42, max_features='sqrt'
+            )
+            self.models['svm'] = cuml.svm.SVC(kernel='linear')
+            self.use_gpu = True
+            self.logger.info("cuML GPU 모델 사용")
+        except (ImportError, OSError, RuntimeError) as e:
+            # GPU/CUDA 런타임이 없는 경우 scikit-learn 모델 유지
+            self.logger.info(f"cuML을 사용할 수 없어 scikit-learn 모델을 사용합니다: {str(e)}")
+        
         # LightGBM이 사용 가능한 경우 추가 (지연 import)
         try:
             import lightgbm as lgb
@@ -139,6 +542,24 @@ class TitanicService:
 
         self.logger.info("🍀🍀 모델링 완료")
 
+    def _training_sets(
+        self, X: np.ndarray, y: np.ndarray
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]]:
+        """
+        모델별 학습용 (X, y, sample_weight) 반환
+        - WEIGHTED_DEDUP_MODELS만 중복 제거 + 가중치, 나머지 모델은 원본 행 그대로
+        - cuML 모델은 sample_weight를 지원하지 않아 GPU 사용 시 모두 원본 그대로
+        """
+        original = (X, y, None)
+        if self.use_gpu:
+            return {model_name: original for model_name in self.models}
+        deduplicated = _deduplicate(X, y)
+        self.logger.info(f"중복 제거 후 학습 행 수: {len(deduplicated[0])} / {len(X)} ({', '.join(sorted(WEIGHTED_DEDUP_MODELS))})")
+        return {
+            model_name: deduplicated if model_name in WEIGHTED_DEDUP_MODELS else original
+            for model_name in self.models
+        }
+
     def learning(self):
         self.logger.info("🍀🍀 학습 시작")
 
@@ -150,10 +571,13 @@ class TitanicService:
         if not self.models:
             self.modeling()
 
+        # 가중치 학습이 원본과 같은 모델은 중복 행을 합치고 등장 횟수를 sample_weight로 사용
+        training_sets = self._training_sets(self.X_train_np, self.y_train_np)
+
         # 각 모델 학습
         for model_name, model in self.models.items():
             self.logger.info(f"{model_name} 학습 시작...")
-            model.fit(self.X_train, self.y_train)
+            _fit_weighted(model, *training_sets[model_name])
             self.logger.info(f"{model_name} 학습 완료")
 
         self.logger.info("🍀🍀 학습 완료")
@@ -169,21 +593,31 @@ class TitanicService:
             self.logger.error("전처리된 데이터가 없습니다. 먼저 preprocess()를 실행해주세요.")
             return {}
 
-        # train 데이터를 train/validation으로 분할
-        X_train_split, X_val_split, y_train_split, y_val_split = train_test_split(
-            self.X_train, self.y_train, test_size=0.2, random_state=42, stratify=self.y_train
-        )
+        # train 데이터를 train/validation으로 분할 (층화 분할 인덱스는 한 번만 계산)
+        if self._split_idx is None:
+            sss = StratifiedShuffleSplit(n_splits=1, test_size=0.2, random_state=42)
+            self._split_idx = next(sss.split(self.X_train_np, self.y_train_np))
+        train_idx, val_idx = self._split_idx
+        X_train_split, X_val_split = self.X_train_np[train_idx], self.X_train_np[val_idx]
+        y_train_split, y_val_split = self.y_train_np[train_idx], self.y_train_np[val_idx]
+        # 학습 분할만 중복 제거 (검증은 원본 행 기준 정확도)
+        training_sets = self._training_sets(X_train_split, y_train_split)
 
         results = {}
         
-        # 각 모델 평가
-        for model_name, model in self.models.items():
-            # 학습 (validation set으로 평가하기 위해)
-            model.fit(X_train_split, y_train_split)
-            # 예측
-            y_pred = model.predict(X_val_split)
-            # 정확도 계산
-            accuracy = accuracy_score(y_val_split, y_pred)
+        # 서로 독립적인 모델들을 여러 코어에서 동시에 학습/평가
+        # (GPU 모델은 CUDA 컨텍스트를 프로세스 간에 공유할 수 없으므로 순차 실행)
+        outputs = Parallel(n_jobs=1 if self.use_gpu else -1, prefer='processes')(
+            delayed(_fit_eval)(model_name, model, *training_sets[model_name], X_val_split, y_val_split)
+            for model_name, model in self.models.items()
+        )
+        
+        for model_name, fitted_model, accuracy in outputs:
+            # 워커에서 끈 모델 내부 병렬화 설정은 원래대로 복원 (submit()의 전체 재학습용)
+            if 'n_jobs' in fitted_model.get_params():
+                fitted_model.set_params(n_jobs=self.models[model_name].get_params()['n_jobs'])
+            # 학습된 모델을 다시 저장 (기존 순차 실행과 동일하게 분할 데이터로 학습된 상태 유지)
+            self.models[model_name] = fitted_model
             results[model_name] = accuracy
             
             # 한글 이름 매핑
@@ -200,39 +634,60 @@ class TitanicService:
         self.logger.info("🍀🍀 평가 완료")
         return results
 
-    def submit(self):
+    def submit(self, force_retrain: bool = False, refit_on_full: bool = True):
         self.logger.info("🍀🍀 제출 시작")
         
         if self.X_train is None or self.y_train is None or self.X_test is None:
             self.logger.error("전처리된 데이터가 없습니다. 먼저 preprocess()를 실행해주세요.")
             return None
         
-        if not self.models:
-            self.logger.error("학습된 모델이 없습니다. 먼저 learning()을 실행해주세요.")
-            return None
-        
-        # 평가를 통해 최고 성능 모델 선택
-        self.logger.info("모델 평가를 통해 최고 성능 모델 선택 중...")
-        results = self.evaluate()
+        use_cache = not force_retrain and self.has_cached_model()
+        if use_cache and self.best_results is None:
+            use_cache = self.load_model()
         
-        if not results:
-            self.logger.error("평가 결과가 없습니다.")
-            return None
-        
-        # 최고 정확도 모델 선택
-        best_model_name = max(results, key=results.get)
-        best_accuracy = results[best_model_name]
-        
-        self.logger.info(f"최고 성능 모델: {best_model_name} (정확도: {best_accuracy:.4f})")
-        
-        # 최고 모델로 전체 train 데이터 재학습
-        best_model = self.models[best_model_name]
-        self.logger.info(f"{best_model_name}로 전체 train 데이터 재학습 중...")
-        best_model.fit(self.X_train, self.y_train)
+        if use_cache:
+            # 저장된 최고 모델 재사용 (평가 및 재학습 생략)
+            self.logger.info(f"저장된 최고 모델 사용: {self.best_model_name} (재학습 생략)")
+            results = self.best_results
+            best_model_name = self.best_model_name
+            best_accuracy = self.best_accuracy
+            best_model = self.best_model
+        else:
+            if not self.models:
+                self.logger.error("학습된 모델이 없습니다. 먼저 learning()을 실행해주세요.")
+                return None
+            
+            # 평가를 통해 최고 성능 모델 선택
+            self.logger.info("모델 평가를 통해 최고 성능 모델 선택 중...")
+            results = self.evaluate()
+            
+            if not results:
+                self.logger.error("평가 결과가 없습니다.")
+                return None
+            
+            # 최고 정확도 모델 선택
+            best_model_name = max(results, key=results.get)
+            best_accuracy = results[best_model_name]
+            
+            self.logger.info(f"최고 성능 모델: {best_model_name} (정확도: {best_accuracy:.4f})")
+            
+            # evaluate()에서 학습 분할로 학습된 모델
+            best_model = self.models[best_model_name]
+            if refit_on_full:
+                # 최고 모델로 전체 train 데이터 재학습
+                self.logger.info(f"{best_model_name}로 전체 train 데이터 재학습 중...")
+                _fit_weighted(best_model, *self._training_sets(self.X_train_np, self.y_train_np)[best_model_name])
+            else:
+                self.logger.info(f"{best_model_name}: evaluate()에서 학습된 모델을 그대로 사용 (재학습 생략)")
+            
+            # 예측용 모델로 설정
+            self._set_best_model(best_model, best_model_name)
+            self.best_accuracy = best_accuracy
+            self.best_results = results
         
-        # test 데이터 예측
+        # test 데이터 예측 (전처리 시 캐시한 float32 행렬 사용)
         self.logger.info("test 데이터 예측 중...")
-        predictions = best_model.predict(self.X_test)
+        predictions = best_model.predict(self.X_test_np)
         
         # PassengerId 추출 (test 데이터에서)
         passenger_ids = self.X_test['PassengerId'].values
@@ -244,8 +699,7 @@ class TitanicService:
         })
         
         # download 폴더에 저장 (절대 경로 사용)
-        download_dir = Path(__file__).parent.parent / 'download'
-        download_dir = download_dir.resolve()  # 절대 경로로 변환
+        download_dir = self.download_dir
         download_dir.mkdir(parents=True, exist_ok=True)
         
         self.logger.info(f"파일 저장 경로: {download_dir}")
@@ -254,7 +708,12 @@ class TitanicService:
         # CSV 파일 저장
         submission_path = download_dir / 'submission.csv'
         try:
-            submission_df.to_csv(submission_path, index=False)
+            # pyarrow C++ CSV writer 사용 (헤더 따옴표 없이 to_csv와 동일한 형식)
+            pacsv.write_csv(
+                pa.Table.from_pandas(submission_df, preserve_index=False),
+                str(submission_path),
+                write_options=pacsv.WriteOptions(quoting_style='none')
+            )
             self.logger.info(f"제출 파일 저장 완료: {submission_path}")
             self.logger.info(f"파일 존재 여부: {submission_path.exists()}")
             self.logger.info(f"파일 크기: {submission_path.stat().st_size if submission_path.exists() else 0} bytes")
@@ -262,16 +721,21 @@ class TitanicService:
             self.logger.error(f"CSV 파일 저장 실패: {str(e)}", exc_info=True)
             raise
         
-        # 모델 파일 저장
-        model_path = download_dir / f'{best_model_name}_model.pkl'
-        try:
-            joblib.dump(best_model, model_path)
-            self.logger.info(f"모델 파일 저장 완료: {model_path}")
-            self.logger.info(f"파일 존재 여부: {model_path.exists()}")
-            self.logger.info(f"파일 크기: {model_path.stat().st_size if model_path.exists() else 0} bytes")
-        except Exception as e:
-            self.logger.error(f"모델 파일 저장 실패: {str(e)}", exc_info=True)
-            raise
+        # 모델 파일 저장 (새로 학습한 경우에만, 다음 요청/재시작 시 재사용)
+        model_path = self.model_cache_path
+        if not use_cache:
+            try:
+                # lz4(또는 zlib) 압축 + pickle protocol 5 (NumPy 배열 zero-copy 직렬화)
+                joblib.dump(
+                    (best_model, best_model_name, best_accuracy, results),
+                    model_path, compress=MODEL_COMPRESS, protocol=5
+                )
+                self.logger.info(f"모델 파일 저장 완료: {model_path}")
+                self.logger.info(f"파일 존재 여부: {model_path.exists()}")
+                self.logger.info(f"파일 크기: {model_path.stat().st_size if model_path.exists() else 0} bytes")
+            except Exception as e:
+                self.logger.error(f"모델 파일 저장 실패: {str(e)}", exc_info=True)
+                raise
         
         # 결과 요약 저장
         summary_path = download_dir / 'model_summary.txt'
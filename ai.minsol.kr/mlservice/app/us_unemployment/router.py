@@ -1,41 +1,15 @@
 """
 미국 실업률 데이터 시각화 라우터
 """
-from fastapi import APIRouter, HTTPException, Query, Body
-from fastapi.responses import HTMLResponse
+from fastapi import APIRouter, HTTPException, Query, Body, Request
+from fastapi.responses import HTMLResponse, Response
 from typing import List, Dict, Any, Optional
-from pathlib import Path
-import sys
+import asyncio
 import logging
-
-# 공통 모듈 경로 추가
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+import threading
 
 from app.us_unemployment.service import USUnemploymentService
-
-# common 모듈 import 시도
-try:
-    from common.utils import create_response, create_error_response, setup_logging
-except ImportError:
-    # common 모듈이 없을 경우 기본 함수 정의
-    def setup_logging(name: str):
-        return logging.getLogger(name)
-    def create_response(data: Any, message: str = "Success", status: str = "success") -> Dict:
-        from datetime import datetime
-        return {
-            "status": status,
-            "message": message,
-            "data": data,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    def create_error_response(message: str, error_code: str = "UNKNOWN_ERROR") -> Dict:
-        from datetime import datetime
-        return {
-            "status": "error",
-            "message": message,
-            "error_code": error_code,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+from common.utils import create_response, create_error_response, setup_logging
 
 # Logger 초기화
 logger = logging.getLogger(__name__)
@@ -44,22 +18,28 @@ router = APIRouter(tags=["usa"])
 
 # 서비스 인스턴스 생성 (싱글톤 패턴)
 _service_instance: Optional[USUnemploymentService] = None
+# 동시에 들어온 첫 요청들이 서비스를 중복 생성하지 않도록 생성 구간만 잠금
+_service_lock = threading.Lock()
 
 
 def get_service() -> USUnemploymentService:
     """USUnemploymentService 싱글톤 인스턴스 반환"""
     global _service_instance
-    if _service_instance is None:
-        logger.info("USUnemploymentService 인스턴스 생성 중...")
-        _service_instance = USUnemploymentService()
-        logger.info("USUnemploymentService 인스턴스 생성 완료")
+    if _service_instance is not None:
+        return _service_instance
+    with _service_lock:
+        if _service_instance is None:
+            logger.info("USUnemploymentService 인스턴스 생성 중...")
+            _service_instance = USUnemploymentService()
+            logger.info("USUnemploymentService 인스턴스 생성 완료")
     return _service_instance
 
 
 @router.get("/")
 async def usa_root():
     """
-    미국 실업률 서비스 루트 및 지도 이미지 생성
+    미국 실업률 서비스 루트 및 지도 이미지 경로
+    - 이미지가 없을 때만 생성 (재생성은 POST /map/image/rebuild)
     
     Returns:
         dict: 서비스 상태 및 지도 이미지 저장 정보
@@ -67,14 +47,8 @@ async def usa_root():
     try:
         service = get_service()
         
-        # 지도를 이미지로 저장
-        image_path = service.save_map_as_image(
-            output_filename="us_unemployment_map.png",
-            fill_color="YlGn",
-            fill_opacity=0.7,
-            line_opacity=0.2,
-            legend_name="Unemployment Rate (%)"
-        )
+        # 저장된 지도 이미지 사용 (없으면 한 번만 생성)
+        image_path = await asyncio.to_thread(service.ensure_map_image, output_filename="us_unemployment_map.png")
         
         return create_response(
             data={
@@ -102,6 +76,7 @@ async def usa_root():
 
 @router.get("/map", response_class=HTMLResponse)
 async def get_map(
+    request: Request,
     fill_color: str = Query(default="YlGn", description="채우기 색상"),
     fill_opacity: float = Query(default=0.7, ge=0.0, le=1.0, description="채우기 투명도"),
     line_opacity: float = Query(default=0.2, ge=0.0, le=1.0, description="선 투명도"),
@@ -111,21 +86,24 @@ async def get_map(
     미국 실업률 지도 생성 및 HTML 반환
     
     Returns:
-        HTMLResponse: Folium 지도 HTML
+        HTMLResponse: Folium 지도 HTML (If-None-Match가 ETag와 같으면 304)
     """
     try:
         service = get_service()
-        map_obj = service.build_map(
+        # 같은 파라미터의 지도는 캐시된 HTML 문자열 재사용
+        html_string, etag = await asyncio.to_thread(
+            service.render_map,
             fill_color=fill_color,
             fill_opacity=fill_opacity,
             line_opacity=line_opacity,
             legend_name=legend_name
         )
         
-        # Folium 지도를 HTML 문자열로 변환
-        html_string = map_obj._repr_html_()
-        
-        return HTMLResponse(content=html_string)
+        # 브라우저가 같은 지도를 이미 가지고 있으면 본문 없이 304 반환
+        headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+        return HTMLResponse(content=html_string, headers=headers)
     except Exception as e:
         logger.error(f"지도 생성 오류: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -149,7 +127,9 @@ async def build_map(
     """
     try:
         service = get_service()
-        map_obj = service.build_map(
+        # HTML 캐시를 미리 채워 두고 메타데이터만 반환 (/map 요청 시 재빌드 없음)
+        html_string = await asyncio.to_thread(
+            service.render_map_html,
             fill_color=fill_color,
             fill_opacity=fill_opacity,
             line_opacity=line_opacity,
@@ -158,7 +138,7 @@ async def build_map(
         
         return create_response(
             data={
-                "map_created": map_obj is not None,
+                "map_created": bool(html_string),
                 "location": service.map_location,
                 "zoom_start": service.zoom_start,
                 "message": "지도가 생성되었습니다. /map 엔드포인트에서 HTML을 확인하세요."
@@ -173,12 +153,33 @@ async def build_map(
         )
 
 
+@router.post("/map/image/rebuild")
+async def rebuild_map_image():
+    """지도 이미지 재생성"""
+    try:
+        service = get_service()
+        image_path = await asyncio.to_thread(
+            service.ensure_map_image, output_filename="us_unemployment_map.png", force=True
+        )
+        
+        return create_response(
+            data={"image_path": image_path, "image_saved": True},
+            message="Map image rebuilt successfully"
+        )
+    except Exception as e:
+        logger.error(f"지도 이미지 재생성 오류: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to rebuild map image: {str(e)}"
+        )
+
+
 @router.get("/data/geo")
 async def get_geo_data():
     """지리 데이터 조회"""
     try:
         service = get_service()
-        geo_data = service.load_geo_data()
+        geo_data = await asyncio.to_thread(service.load_geo_data)
         
         return create_response(
             data={
@@ -200,17 +201,18 @@ async def get_unemployment_data():
     """실업률 데이터 조회"""
     try:
         service = get_service()
-        unemployment_data = service.load_unemployment_data()
+        unemployment_data = await asyncio.to_thread(service.load_unemployment_data)
         
-        # DataFrame을 딕셔너리로 변환 (일부만 반환)
-        data_dict = unemployment_data.head(10).to_dict(orient="records")
+        # Arrow 테이블에서 바로 레코드 변환 (일부만 반환)
+        data_dict = service.sample_records(10)
+        data_loaded = unemployment_data is not None
         
         return create_response(
             data={
-                "data_loaded": unemployment_data is not None,
-                "total_states": len(unemployment_data) if unemployment_data is not None else 0,
+                "data_loaded": data_loaded,
+                "total_states": len(unemployment_data) if data_loaded else 0,
                 "sample_data": data_dict,
-                "columns": unemployment_data.columns.tolist() if unemployment_data is not None else []
+                "columns": service.state_columns
             },
             message="Unemployment data loaded successfully"
         )
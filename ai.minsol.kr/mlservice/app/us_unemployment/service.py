@@ -1,13 +1,79 @@
+import hashlib
 import requests
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import folium
+from branca.colormap import StepColormap
+from branca.utilities import color_brewer
 import logging
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import json
 
 logger = logging.getLogger(__name__)
 
+# 기본 데이터/저장 경로 (모듈 로드 시 한 번만 계산하고 save 폴더도 한 번만 생성)
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_GEO_DATA_PATH = BASE_DIR / "data" / "us-states.json"
+DEFAULT_DATA_PATH = BASE_DIR / "data" / "us_unemployment.csv"
+SAVE_DIR = BASE_DIR / "save"
+SAVE_DIR.mkdir(parents=True, exist_ok=True)
+
+# 렌더링된 지도 HTML 캐시 최대 개수 (스타일 파라미터 조합 기준)
+MAP_HTML_CACHE_SIZE = 16
+
+# 단계 구분도 구간 수 (folium.Choropleth 기본값과 동일한 등간격 6구간)
+CHOROPLETH_BINS = 6
+
+# Playwright 브라우저는 프로세스 전체에서 하나만 띄워 재사용
+# sync API 객체는 생성한 스레드에서만 사용할 수 있으므로 전용 단일 스레드에서 모든 작업 실행
+_PW_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="playwright")
+_PW = None
+_BROWSER = None
+
+
+def _get_browser():
+    """Playwright Chromium 브라우저 반환 (전용 스레드에서 최초 호출 시 한 번만 실행)"""
+    global _PW, _BROWSER
+    if _BROWSER is None:
+        from playwright.sync_api import sync_playwright
+        _PW = sync_playwright().start()
+        _BROWSER = _PW.chromium.launch(headless=True)
+        logger.info("Playwright 브라우저 실행 완료")
+    return _BROWSER
+
+
+def _screenshot(html_path: Path, output_path: Path) -> None:
+    """공유 브라우저에서 새 페이지만 열어 HTML을 스크린샷으로 저장"""
+    page = _get_browser().new_page(viewport={'width': 1920, 'height': 1080})
+    try:
+        page.goto(f"file://{html_path.resolve()}", wait_until='networkidle')
+        # 고정 대기 대신 문서와 Leaflet 로드 완료 시점까지 대기
+        page.wait_for_function("document.readyState === 'complete' && window.L !== undefined")
+        page.screenshot(path=str(output_path), full_page=True)
+    finally:
+        page.close()
+
+
+def _close_browser() -> None:
+    global _PW, _BROWSER
+    if _BROWSER is not None:
+        _BROWSER.close()
+        _BROWSER = None
+    if _PW is not None:
+        _PW.stop()
+        _PW = None
+
+
+def close_browser() -> None:
+    """앱 종료 시 공유 Playwright 브라우저 정리"""
+    _PW_EXECUTOR.submit(_close_browser).result()
+    _PW_EXECUTOR.shutdown(wait=True)
+
 
 class USUnemploymentService:
     """미국 실업률 데이터 시각화 서비스"""
@@ -28,38 +94,59 @@ class USUnemploymentService:
             map_location: 지도 중심 좌표 [위도, 경도]
             zoom_start: 초기 줌 레벨
         """
-        # 파일 경로 설정
-        base_dir = Path(__file__).parent
-        if geo_data_path is None:
-            geo_data_path = str(base_dir / "data" / "us-states.json")
-        if data_path is None:
-            data_path = str(base_dir / "data" / "us_unemployment.csv")
-        
-        self.geo_data_path = Path(geo_data_path)
-        self.data_path = Path(data_path)
+        # 파일 경로 설정 (지정하지 않으면 모듈 기본 경로 사용)
+        self.geo_data_path = Path(geo_data_path) if geo_data_path is not None else DEFAULT_GEO_DATA_PATH
+        self.data_path = Path(data_path) if data_path is not None else DEFAULT_DATA_PATH
         self.map_location = map_location
         self.zoom_start = zoom_start
         
         # save 폴더 경로
-        self.save_dir = base_dir / "save"
-        self.save_dir.mkdir(parents=True, exist_ok=True)
+        self.save_dir = SAVE_DIR
         
         self.state_geo = None
         self.state_data = None
+        # 실업률 데이터 원본 Arrow 테이블 (샘플 레코드 조회용)
+        self.state_table: Optional[pa.Table] = None
+        # 요청마다 새 리스트를 만들지 않도록 컬럼 목록/샘플 레코드를 캐시
+        self.state_columns: List[str] = []
+        self._sample_cache: Dict[int, list] = {}
+        # fill_color -> (주별 색상, 구간 경계, 구간 색상) - 데이터가 고정이므로 팔레트별로 한 번만 계산
+        self._color_cache: Dict[str, Tuple[Dict[str, str], np.ndarray, List[str]]] = {}
         self.map = None
         
+        # (fill_color, fill_opacity, line_opacity, legend_name) -> (지도 HTML, ETag)
+        # 입력 데이터는 런타임에 바뀌지 않으므로 프로세스 수명 동안 유지
+        self._html_cache: Dict[Tuple[str, float, float, str], Tuple[str, str]] = {}
+        self._map_lock = threading.Lock()
+        # 지도 이미지는 입력 데이터가 고정이므로 한 번만 생성 (동시 생성 방지)
+        self._image_lock = threading.Lock()
+        
+        # 런타임에 바뀌지 않는 입력 데이터는 초기화 시 한 번만 로드 (실패해도 요청 시 재시도)
+        try:
+            self.load_geo_data()
+            self.load_unemployment_data()
+        except Exception as e:
+            logger.warning(f"초기 데이터 로드 실패 (요청 시 다시 시도합니다): {str(e)}")
+        
         logger.info("UnemploymentService 초기화 완료")
     
     def load_geo_data(self) -> dict:
         """
-        지리 데이터 로드 (로컬 파일)
+        지리 데이터 로드 (로컬 파일, 한 번 로드한 데이터는 재사용)
         
         Returns:
             dict: 지리 데이터 JSON
         """
+        if self.state_geo is not None:
+            return self.state_geo
         try:
-            with open(self.geo_data_path, 'r', encoding='utf-8') as f:
-                self.state_geo = json.load(f)
+            # orjson이 설치된 경우 더 빠른 파서 사용 (지연 import)
+            try:
+                import orjson
+                self.state_geo = orjson.loads(self.geo_data_path.read_bytes())
+            except ImportError:
+                with open(self.geo_data_path, 'r', encoding='utf-8') as f:
+                    self.state_geo = json.load(f)
             logger.info(f"지리 데이터 로드 완료: {self.geo_data_path}")
             return self.state_geo
         except Exception as e:
@@ -68,19 +155,39 @@ class USUnemploymentService:
     
     def load_unemployment_data(self) -> pd.DataFrame:
         """
-        실업률 데이터 로드 (로컬 파일)
+        실업률 데이터 로드 (로컬 파일, 한 번 로드한 데이터는 재사용)
         
         Returns:
             pd.DataFrame: 실업률 데이터
         """
+        if self.state_data is not None:
+            return self.state_data
         try:
-            self.state_data = pd.read_csv(self.data_path)
+            # pyarrow C++ CSV 파서로 읽은 뒤 pandas로 변환
+            # (Folium Choropleth가 NumPy 기반 컬럼을 기대하므로 ArrowDtype은 사용하지 않음)
+            self.state_table = pacsv.read_csv(str(self.data_path))
+            self.state_data = self.state_table.to_pandas()
+            self.state_columns = self.state_table.column_names
             logger.info(f"실업률 데이터 로드 완료: {self.data_path}")
             return self.state_data
         except Exception as e:
             logger.error(f"실업률 데이터 로드 실패: {str(e)}")
             raise
     
+    def sample_records(self, n: int = 10) -> list:
+        """
+        실업률 데이터 앞부분 n개를 레코드(dict) 리스트로 반환 (pandas 변환 없이 Arrow에서 직접)
+        
+        Returns:
+            list: [{"State": ..., "Unemployment": ...}, ...]
+        """
+        records = self._sample_cache.get(n)
+        if records is None:
+            self.load_unemployment_data()
+            records = self.state_table.slice(0, n).to_pylist()
+            self._sample_cache[n] = records
+        return records
+    
     def create_map(self) -> folium.Map:
         """
         Folium 지도 생성
@@ -120,20 +227,50 @@ class USUnemploymentService:
         if self.state_data is None:
             self.load_unemployment_data()
         
-        folium.Choropleth(
-            geo_data=self.state_geo,
+        # folium.Choropleth는 생성할 때마다 구간/색상을 다시 계산하므로
+        # 미리 계산한 주별 색상을 dict 조회만 하는 GeoJson 레이어로 대체
+        color_map, bin_edges, colors = self._state_colors(fill_color)
+        folium.GeoJson(
+            self.state_geo,
             name="choropleth",
-            data=self.state_data,
-            columns=["State", "Unemployment"],
-            key_on="feature.id",
-            fill_color=fill_color,
-            fill_opacity=fill_opacity,
-            line_opacity=line_opacity,
-            legend_name=legend_name,
+            style_function=lambda feature: {
+                "fillColor": color_map.get(feature["id"], "black"),
+                "fillOpacity": fill_opacity,
+                "color": "black",
+                "weight": 1,
+                "opacity": line_opacity,
+            },
+        ).add_to(self.map)
+        StepColormap(
+            colors,
+            index=bin_edges,
+            vmin=float(bin_edges[0]),
+            vmax=float(bin_edges[-1]),
+            caption=legend_name,
         ).add_to(self.map)
         
         logger.info("Choropleth 레이어 추가 완료")
     
+    def _state_colors(self, fill_color: str) -> Tuple[Dict[str, str], np.ndarray, List[str]]:
+        """
+        주(State)별 채우기 색상 계산 (팔레트별 캐시)
+        
+        Returns:
+            Tuple: ({주 코드: 색상}, 구간 경계, 구간 색상 리스트)
+        """
+        cached = self._color_cache.get(fill_color)
+        if cached is not None:
+            return cached
+        
+        values = self.state_data["Unemployment"].to_numpy(dtype=float)
+        bin_edges = np.histogram_bin_edges(values, bins=CHOROPLETH_BINS)
+        colors = color_brewer(fill_color, n=len(bin_edges) - 1)
+        bin_index = np.clip(np.digitize(values, bin_edges) - 1, 0, len(colors) - 1)
+        color_map = dict(zip(self.state_data["State"].tolist(), [colors[i] for i in bin_index]))
+        
+        self._color_cache[fill_color] = (color_map, bin_edges, colors)
+        return self._color_cache[fill_color]
+    
     def add_layer_control(self) -> None:
         """레이어 컨트롤 추가"""
         if self.map is None:
@@ -170,6 +307,54 @@ class USUnemploymentService:
         logger.info("지도 빌드 완료")
         return self.map
     
+    def render_map_html(
+        self,
+        fill_color: str = "YlGn",
+        fill_opacity: float = 0.7,
+        line_opacity: float = 0.2,
+        legend_name: str = "Unemployment Rate (%)"
+    ) -> str:
+        """
+        지도 HTML 문자열 반환 (같은 스타일 파라미터면 캐시된 HTML 재사용)
+        
+        Folium의 _repr_html_()은 폴리곤 수에 비례해 수 초가 걸리므로
+        빌드 결과 대신 최종 HTML 문자열을 캐시합니다.
+        
+        Returns:
+            str: Folium 지도 HTML
+        """
+        return self.render_map(fill_color, fill_opacity, line_opacity, legend_name)[0]
+    
+    def render_map(
+        self,
+        fill_color: str = "YlGn",
+        fill_opacity: float = 0.7,
+        line_opacity: float = 0.2,
+        legend_name: str = "Unemployment Rate (%)"
+    ) -> Tuple[str, str]:
+        """
+        지도 HTML과 ETag 반환 (HTML과 함께 캐시되므로 요청마다 해시를 다시 계산하지 않음)
+        
+        Returns:
+            Tuple[str, str]: (Folium 지도 HTML, HTML 내용 기반 ETag)
+        """
+        key = (fill_color, round(fill_opacity, 3), round(line_opacity, 3), legend_name)
+        cached = self._html_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # 지도 빌드는 self.map 상태를 바꾸므로 한 번에 하나만 실행
+        with self._map_lock:
+            cached = self._html_cache.get(key)
+            if cached is None:
+                html = self.build_map(fill_color, fill_opacity, line_opacity, legend_name)._repr_html_()
+                etag = hashlib.md5(html.encode("utf-8")).hexdigest()
+                if len(self._html_cache) >= MAP_HTML_CACHE_SIZE:
+                    self._html_cache.clear()
+                cached = self._html_cache[key] = (html, etag)
+                logger.info(f"지도 HTML 캐시 저장: {key}")
+        return cached
+    
     def get_map(self) -> Optional[folium.Map]:
         """
         현재 지도 객체 반환
@@ -179,19 +364,100 @@ class USUnemploymentService:
         """
         return self.map
     
-    def save_map_as_image(
+    def ensure_map_image(self, output_filename: str = "us_unemployment_map.png", force: bool = False) -> str:
+        """
+        저장된 지도 이미지 경로 반환 (없거나 force=True일 때만 생성)
+        
+        Args:
+            output_filename: 출력 파일명
+            force: 기존 파일이 있어도 다시 생성할지 여부
+            
+        Returns:
+            str: 저장된 이미지(또는 변환 실패 시 HTML) 파일 경로
+        """
+        candidates = [self.save_dir / output_filename, self.save_dir / output_filename.replace('.png', '.html')]
+        if not force:
+            for path in candidates:
+                if path.exists():
+                    return str(path)
+        
+        with self._image_lock:
+            # 다른 요청이 대기 중에 이미 생성했을 수 있으므로 다시 확인
+            if not force:
+                for path in candidates:
+                    if path.exists():
+                        return str(path)
+            return self.save_map_as_image(output_filename)
+    
+    def save_map_as_image_static(
         self,
         output_filename: str = "us_unemployment_map.png",
         fill_color: str = "YlGn",
         fill_opacity: float = 0.7,
         line_opacity: float = 0.2,
         legend_name: str = "Unemployment Rate (%)"
+    ) -> str:
+        """
+        geopandas + matplotlib으로 정적 choropleth 이미지 저장 (브라우저 불필요)
+        
+        Args:
+            output_filename: 출력 파일명
+            fill_color: 채우기 색상 (matplotlib colormap 이름)
+            fill_opacity: 채우기 투명도
+            line_opacity: 선 투명도
+            legend_name: 범례 이름
+            
+        Returns:
+            str: 저장된 이미지 파일 경로
+        """
+        # geopandas가 설치된 경우에만 사용 (지연 import)
+        import geopandas as gpd
+        from matplotlib.figure import Figure
+        
+        geo = self.load_geo_data()
+        data = self.load_unemployment_data()
+        
+        # GeoJSON feature id(주 코드)를 CSV의 State 컬럼과 병합
+        gdf = gpd.GeoDataFrame.from_features(geo["features"])
+        gdf["State"] = [feature.get("id") for feature in geo["features"]]
+        gdf = gdf.merge(data[["State", "Unemployment"]], on="State", how="left")
+        
+        # pyplot 전역 상태를 쓰지 않는 Figure 객체 사용 (스레드 안전)
+        fig = Figure(figsize=(16, 9))
+        ax = fig.subplots()
+        gdf.plot(
+            ax=ax,
+            column="Unemployment",
+            cmap=fill_color,
+            alpha=fill_opacity,
+            edgecolor="none",
+            legend=True,
+            legend_kwds={"label": legend_name},
+        )
+        # 경계선은 채우기와 별도의 투명도(line_opacity)로 고정 두께 0.2pt
+        gdf.boundary.plot(ax=ax, color="gray", alpha=line_opacity, linewidth=0.2)
+        ax.set_axis_off()
+        
+        output_path = self.save_dir / output_filename
+        fig.savefig(str(output_path), dpi=150, bbox_inches="tight")
+        logger.info(f"지도 이미지 저장 완료 (matplotlib): {output_path}")
+        return str(output_path)
+    
+    def save_map_as_image(
+        self,
+        output_filename: str = "us_unemployment_map.png",
+        fill_color: str = "YlGn",
+        fill_opacity: float = 0.7,
+        line_opacity: float = 0.2,
+        legend_name: str = "Unemployment Rate (%)",
+        renderer: str = "matplotlib"
     ) -> str:
         """
         지도를 이미지로 저장
         
-        Folium 지도는 HTML/JavaScript 기반이므로 이미지로 변환하려면 브라우저 렌더링이 필요합니다.
-        Playwright를 우선 사용하고, 없으면 HTML 파일로 저장합니다.
+        기본값은 geopandas + matplotlib 정적 렌더링입니다.
+        renderer="playwright"이거나 geopandas가 없으면 Folium 지도를 브라우저로 렌더링하고,
+        Playwright도 없으면 HTML 파일로 저장합니다.
         
         Args:
             output_filename: 출력 파일명
@@ -199,57 +465,51 @@ class USUnemploymentService:
             fill_opacity: 채우기 투명도
             line_opacity: 선 투명도
             legend_name: 범례 이름
+            renderer: "matplotlib" 또는 "playwright"
             
         Returns:
             str: 저장된 이미지 파일 경로
         """
+        if renderer == "matplotlib":
+            try:
+                return self.save_map_as_image_static(
+                    output_filename, fill_color, fill_opacity, line_opacity, legend_name
+                )
+            except ImportError as e:
+                logger.warning(f"geopandas를 사용할 수 없어 Playwright로 렌더링합니다: {str(e)}")
+        
         try:
-            # 지도 생성
-            self.build_map(fill_color, fill_opacity, line_opacity, legend_name)
-            
-            if self.map is None:
-                raise ValueError("지도가 생성되지 않았습니다.")
-            
-            # 임시 HTML 파일 저장
             temp_html = self.save_dir / "temp_map.html"
-            self.map.save(str(temp_html))
+            # 지도 빌드는 self.map 상태를 바꾸므로 render_map과 같은 잠금 안에서 빌드/저장
+            # (이후 빌드는 새 Map 객체를 만들므로 잠금 밖에서는 이번에 만든 객체만 사용)
+            with self._map_lock:
+                folium_map = self.build_map(fill_color, fill_opacity, line_opacity, legend_name)
+                
+                if folium_map is None:
+                    raise ValueError("지도가 생성되지 않았습니다.")
+                
+                # 임시 HTML 파일 저장
+                folium_map.save(str(temp_html))
             
             output_path = self.save_dir / output_filename
             
             # Playwright를 사용하여 이미지로 변환 (selenium보다 간단하고 빠름)
             try:
-                from playwright.sync_api import sync_playwright
-                import time
-                import os
+                # 공유 브라우저 전용 스레드에서 스크린샷 저장 (브라우저 재실행 없음)
+                _PW_EXECUTOR.submit(_screenshot, temp_html, output_path).result()
+                logger.info(f"지도 이미지 저장 완료 (Playwright): {output_path}")
                 
-                with sync_playwright() as p:
-                    browser = p.chromium.launch(headless=True)
-                    page = browser.new_page(viewport={'width': 1920, 'height': 1080})
-                    
-                    # HTML 파일 로드
-                    file_url = f"file://{temp_html.resolve()}"
-                    page.goto(file_url, wait_until='networkidle')
-                    
-                    # 지도 렌더링 대기
-                    time.sleep(2)
-                    
-                    # 스크린샷 저장
-                    page.screenshot(path=str(output_path), full_page=True)
-                    browser.close()
-                    
-                    logger.info(f"지도 이미지 저장 완료 (Playwright): {output_path}")
-                    
-                    # 임시 HTML 파일 삭제
-                    if temp_html.exists():
-                        temp_html.unlink()
-                    
-                    return str(output_path)
+                # 임시 HTML 파일 삭제
+                if temp_html.exists():
+                    temp_html.unlink()
+                
+                return str(output_path)
                     
             except ImportError:
                 # Playwright가 없으면 HTML 파일로 저장
                 logger.warning("Playwright가 설치되지 않아 HTML 파일로 저장합니다.")
                 html_path = self.save_dir / output_filename.replace('.png', '.html')
-                self.map.save(str(html_path))
+                folium_map.save(str(html_path))
                 logger.info(f"지도 HTML 저장 완료: {html_path}")
                 logger.warning("이미지로 변환하려면 Playwright를 설치하세요: pip install playwright && playwright install chromium")
                 # HTML 파일 경로 반환 (이미지가 아니지만 경로는 반환)
@@ -258,7 +518,7 @@ class USUnemploymentService:
                 logger.error(f"Playwright로 이미지 저장 실패: {str(e)}", exc_info=True)
                 # 실패해도 HTML은 저장
                 html_path = self.save_dir / output_filename.replace('.png', '.html')
-                self.map.save(str(html_path))
+                folium_map.save(str(html_path))
                 logger.info(f"지도 HTML 저장 완료 (이미지 변환 실패): {html_path}")
                 return str(html_path)
                 
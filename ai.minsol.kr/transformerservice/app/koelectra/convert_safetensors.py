@@ -0,0 +1,66 @@
+"""
+KoELECTRA safetensors 변환 스크립트
+.bin 체크포인트만 있는 분류 모델을 safetensors로 변환 (서비스 기동 시 mmap으로 빠르게 로드)
+서빙 중에는 모델 디렉토리에 쓰지 않으므로 배포 전에 한 번 실행
+"""
+import logging
+import os
+import tempfile
+from pathlib import Path
+from transformers import AutoConfig, AutoModelForSequenceClassification
+
+logger = logging.getLogger(__name__)
+
+
+def convert_to_safetensors(model_path: Path) -> bool:
+    """
+    pytorch_model.bin을 model.safetensors로 변환
+
+    - 분류 헤드까지 학습된 체크포인트만 변환 (base 체크포인트에 붙인 랜덤 헤드를 저장하지 않음)
+    - config.json은 건드리지 않고, 임시 디렉토리에 저장한 뒤 원자적으로 이동
+
+    Args:
+        model_path: 모델 디렉토리 (config.json, pytorch_model.bin)
+
+    Returns:
+        변환했으면 True
+    """
+    target_path = model_path / "model.safetensors"
+    if target_path.exists():
+        logger.info(f"이미 safetensors 체크포인트가 있습니다: {target_path}")
+        return False
+    if not (model_path / "pytorch_model.bin").exists():
+        logger.warning(f"변환할 pytorch_model.bin이 없습니다: {model_path}")
+        return False
+
+    architecture = (AutoConfig.from_pretrained(str(model_path)).architectures or [""])[0]
+    if not architecture.endswith("ForSequenceClassification"):
+        logger.warning(f"분류 헤드가 없는 체크포인트({architecture or 'unknown'})는 변환하지 않습니다")
+        return False
+
+    model, loading_info = AutoModelForSequenceClassification.from_pretrained(
+        str(model_path), use_safetensors=False, output_loading_info=True
+    )
+    if loading_info["missing_keys"]:
+        # 새로 초기화된 가중치가 있으면 학습된 분류기가 아니므로 저장하지 않음
+        logger.warning(f"체크포인트에 없는 가중치가 있어 변환하지 않습니다: {loading_info['missing_keys']}")
+        return False
+
+    with tempfile.TemporaryDirectory(dir=str(model_path)) as tmp_dir:
+        model.save_pretrained(tmp_dir, safe_serialization=True)
+        tmp_path = Path(tmp_dir) / "model.safetensors"
+        if not tmp_path.exists():
+            # 샤딩된 체크포인트 등 단일 파일로 저장되지 않은 경우
+            logger.warning("단일 model.safetensors 파일로 저장되지 않아 변환하지 않습니다")
+            return False
+        os.replace(tmp_path, target_path)
+    logger.info(f"safetensors 변환 완료: {target_path}")
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    convert_to_safetensors(Path(__file__).parent / "koelectra_model")
@@ -0,0 +1,106 @@
+"""
+KoELECTRA ONNX 변환 스크립트
+학습된 모델을 ONNX로 내보내고 트랜스포머 그래프 최적화 및 int8 동적 양자화 (USE_ORT=1일 때 사용)
+USE_ORT=1로 서버를 실행하면 uvicorn 워커를 띄우기 전에 main에서 한 번 호출 (서빙 경로에서는 세션만 로드)
+"""
+import logging
+from pathlib import Path
+import torch
+from transformers import AutoTokenizer
+try:
+    from app.koelectra.koelectra_loader import load_classification_model
+except ImportError:
+    # 스크립트로 직접 실행한 경우 (python export_onnx.py)
+    from koelectra_loader import load_classification_model
+
+logger = logging.getLogger(__name__)
+
+
+def export_onnx(model_path: Path, opset_version: int = 14) -> Path:
+    """
+    모델을 ONNX(fp32)로 내보내고 최적화(fp32, GPU용) 및 int8 동적 양자화(CPU용) 모델을 생성
+    
+    Args:
+        model_path: 모델 디렉토리 (config.json, 가중치, 토크나이저)
+        opset_version: ONNX opset 버전
+        
+    Returns:
+        양자화된 ONNX 모델 경로 (model_path / "model_int8.onnx")
+    """
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    
+    fp32_path = model_path / "model_fp32.onnx"
+    optimized_path = model_path / "model_optimized.onnx"
+    int8_path = model_path / "model_int8.onnx"
+    
+    logger.info(f"모델 로딩 중: {model_path}")
+    tokenizer = AutoTokenizer.from_pretrained(str(model_path), use_fast=True)
+    model = load_classification_model(model_path, num_labels=2)
+    model.eval()
+    
+    # ELECTRA forward 인자 순서대로 입력 구성 (배치/시퀀스 길이는 동적 축)
+    dummy = tokenizer("ONNX 변환용 예시 문장입니다.", return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+    
+    logger.info("ONNX 변환 중...")
+    # 트레이싱은 inference 텐서를 지원하지 않으므로 inference_mode 대신 no_grad 사용
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(dummy[name] for name in input_names),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset_version
+        )
+    logger.info(f"ONNX(fp32) 저장 완료: {fp32_path}")
+    
+    # 어텐션/LayerNorm/bias-GELU 융합 (ELECTRA 인코더는 BERT와 같은 구조)
+    source_path = fp32_path
+    try:
+        from onnxruntime.transformers import optimizer
+        optimized = optimizer.optimize_model(
+            str(fp32_path),
+            model_type="bert",
+            num_heads=model.config.num_attention_heads,
+            hidden_size=model.config.hidden_size
+        )
+        optimized.save_model_to_file(str(optimized_path))
+        source_path = optimized_path
+        logger.info(f"ONNX 그래프 최적화 저장 완료: {optimized_path}")
+    except Exception as e:
+        logger.warning(f"ONNX 그래프 최적화 실패, 원본 그래프를 양자화합니다: {str(e)}")
+    
+    # 가중치만 int8로 양자화 (활성값은 실행 시 동적으로 양자화)
+    quantize_dynamic(str(source_path), str(int8_path), weight_type=QuantType.QInt8)
+    logger.info(f"ONNX(int8) 저장 완료: {int8_path}")
+    return int8_path
+
+
+def ensure_onnx_models(model_path: Path) -> bool:
+    """
+    ONNX 모델이 없을 때만 변환 (워커 프로세스를 띄우기 전에 한 번 호출)
+    
+    Returns:
+        ONNX 모델이 준비되었으면 True
+    """
+    if (model_path / "model_int8.onnx").exists():
+        return True
+    try:
+        logger.info(f"ONNX 모델이 없어 변환을 시작합니다: {model_path}")
+        export_onnx(model_path)
+        return True
+    except Exception as e:
+        logger.warning(f"ONNX 변환 실패, torch로 추론합니다: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    export_onnx(Path(__file__).parent / "koelectra_model")
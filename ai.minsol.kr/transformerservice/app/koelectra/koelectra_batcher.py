@@ -0,0 +1,83 @@
+"""
+KoELECTRA 단건 감정분석 동적 배처
+동시에 들어온 /analyze 요청을 짧은 시간 동안 모아 한 번의 predict_batch 호출로 처리
+"""
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+
+from app.koelectra.koelectra_service import KoElectraService, SentimentResult
+
+logger = logging.getLogger(__name__)
+
+
+class SentimentBatcher:
+    """asyncio 큐에 쌓인 텍스트를 최대 max_batch개, max_wait_ms 이내로 묶어서 분석"""
+
+    def __init__(self, service: KoElectraService, max_batch: int = 32, max_wait_ms: float = 3.0):
+        self.service = service
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _ensure_worker(self):
+        """실행 중인 이벤트 루프에서 백그라운드 워커를 최초 한 번 시작"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    def start(self):
+        """이벤트 루프 안(lifespan 시작 시)에서 백그라운드 워커 시작"""
+        self._ensure_worker()
+
+    async def stop(self):
+        """백그라운드 워커 종료"""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def predict(self, text: str) -> SentimentResult:
+        """텍스트 하나를 큐에 넣고 배치 분석 결과를 기다림"""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[str, asyncio.Future]]:
+        """첫 요청을 기다린 뒤 max_wait 동안 추가 요청을 모음"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            texts = [text for text, _ in batch]
+            try:
+                # 모델 추론은 블로킹 작업이므로 스레드에서 한 번에 실행
+                results = await asyncio.to_thread(self.service.predict_batch, texts)
+            except Exception as e:
+                logger.error(f"배치 감정 분석 실패 ({len(batch)}건): {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                # 클라이언트 연결이 끊겨 취소된 요청은 건너뜀
+                if not future.done():
+                    future.set_result(result)
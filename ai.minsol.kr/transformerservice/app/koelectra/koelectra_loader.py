@@ -0,0 +1,49 @@
+"""
+KoELECTRA 분류 모델 로더
+서비스와 훈련 스크립트가 함께 사용 (config.json의 architectures로 로드 방식을 한 번에 결정)
+"""
+import logging
+from pathlib import Path
+from transformers import (
+    AutoConfig,
+    AutoModelForSequenceClassification,
+    ElectraForSequenceClassification,
+    ElectraModel
+)
+
+logger = logging.getLogger(__name__)
+
+
+def load_classification_model(model_path: Path, num_labels: int = 2, **load_kwargs):
+    """
+    시퀀스 분류 모델 로드
+    
+    분류용으로 저장된 체크포인트는 그대로 로드하고, 사전학습 base 모델 체크포인트면
+    ElectraModel을 로드한 뒤 새 분류 헤드를 붙임 (실패할 로드를 먼저 시도하지 않음)
+    
+    Args:
+        model_path: 모델 디렉토리 (config.json, 가중치)
+        num_labels: 분류 라벨 수
+        load_kwargs: from_pretrained에 전달할 추가 옵션
+        
+    Returns:
+        ElectraForSequenceClassification 등 시퀀스 분류 모델
+    """
+    config = AutoConfig.from_pretrained(str(model_path))
+    architecture = (config.architectures or [""])[0]
+    
+    if architecture.endswith("ForSequenceClassification"):
+        model = AutoModelForSequenceClassification.from_pretrained(
+            str(model_path), num_labels=num_labels, **load_kwargs
+        )
+        logger.info(f"{architecture} 체크포인트로 모델 로딩 성공")
+        return model
+    
+    # Base 모델로 로드 후 분류 헤드 추가
+    logger.info(f"분류 헤드가 없는 체크포인트({architecture or 'unknown'}), Base 모델 + 분류 헤드로 구성")
+    base_model = ElectraModel.from_pretrained(str(model_path), **load_kwargs)
+    config = base_model.config
+    config.num_labels = num_labels
+    model = ElectraForSequenceClassification(config)
+    model.electra = base_model
+    return model
@@ -1,67 +1,80 @@
 """
 KoELECTRA 감정분석 라우터
 """
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any, Optional
-from pathlib import Path
-import sys
+from fastapi import APIRouter, HTTPException, Depends, FastAPI, Request
+from fastapi.responses import Response
+from typing import Annotated, List, Dict, Any, Optional
+import asyncio
 import logging
-from datetime import datetime
-from pydantic import BaseModel, Field
-
-# 공통 모듈 경로 추가
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+import threading
+import msgspec
 
 from app.koelectra.koelectra_service import KoElectraService
+from app.koelectra.koelectra_batcher import SentimentBatcher
+from app.koelectra.koelectra_worker import WORKER_SOCKET, RemoteKoElectraService
+from common.utils import create_response, create_error_response
 
 
-# Pydantic 모델 정의
-class SentimentAnalysisRequest(BaseModel):
+# 요청 모델 정의 (msgspec: JSON 디코딩과 검증을 한 번에 처리해 pydantic보다 빠름)
+class SentimentAnalysisRequest(msgspec.Struct):
     """감정 분석 요청 모델"""
-    text: str = Field(..., description="감정 분석할 텍스트", min_length=1, example="이 영화 정말 재미있어요!")
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "text": "이 영화 정말 재미있어요!"
-            }
-        }
+    text: Annotated[str, msgspec.Meta(
+        min_length=1,
+        description="감정 분석할 텍스트",
+        examples=["이 영화 정말 재미있어요!"]
+    )]
 
 
-class BatchSentimentAnalysisRequest(BaseModel):
+class BatchSentimentAnalysisRequest(msgspec.Struct):
     """배치 감정 분석 요청 모델"""
-    texts: List[str] = Field(..., description="감정 분석할 텍스트 리스트", min_items=1, max_items=100)
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "texts": [
-                    "이 영화 정말 재미있어요!",
-                    "별로 재미없었어요."
-                ]
-            }
-        }
+    texts: Annotated[List[str], msgspec.Meta(
+        min_length=1,
+        max_length=100,
+        description="감정 분석할 텍스트 리스트",
+        examples=[["이 영화 정말 재미있어요!", "별로 재미없었어요."]]
+    )]
 
-# common 모듈 import 시도
-try:
-    from common.utils import create_response, create_error_response
-except ImportError:
-    # common 모듈이 없을 경우 기본 함수 정의
-    def create_response(data: Any, message: str = "Success", status: str = "success") -> Dict:
-        return {
-            "status": status,
-            "message": message,
-            "data": data,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    
-    def create_error_response(message: str, error_code: str = "UNKNOWN_ERROR") -> Dict:
-        return {
-            "status": "error",
-            "message": message,
-            "error_code": error_code,
-            "timestamp": datetime.utcnow().isoformat()
+
+# 디코더는 타입별로 한 번만 생성해 재사용
+_sentiment_decoder = msgspec.json.Decoder(SentimentAnalysisRequest)
+_batch_sentiment_decoder = msgspec.json.Decoder(BatchSentimentAnalysisRequest)
+
+
+def _decode_body(decoder: msgspec.json.Decoder, raw: bytes):
+    """요청 본문을 디코딩 (형식/검증 오류는 422)"""
+    try:
+        return decoder.decode(raw)
+    except (msgspec.ValidationError, msgspec.DecodeError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+async def parse_sentiment_request(request: Request) -> SentimentAnalysisRequest:
+    """/analyze 요청 본문 파싱"""
+    return _decode_body(_sentiment_decoder, await request.body())
+
+
+async def parse_batch_sentiment_request(request: Request) -> BatchSentimentAnalysisRequest:
+    """/analyze-batch 요청 본문 파싱"""
+    return _decode_body(_batch_sentiment_decoder, await request.body())
+
+
+class MsgspecJSONResponse(Response):
+    """msgspec으로 인코딩하는 JSON 응답 (SentimentResult 구조체를 딕셔너리 변환 없이 직렬화)"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return msgspec.json.encode(content)
+
+
+def _request_body_schema(struct_type: type) -> Dict[str, Any]:
+    """msgspec 모델의 JSON 스키마를 OpenAPI 요청 본문으로 등록 (Swagger 문서 유지)"""
+    schema = msgspec.json.schema(struct_type)["$defs"][struct_type.__name__]
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": schema}}
         }
+    }
 
 logger = logging.getLogger(__name__)
 
@@ -69,25 +82,73 @@ router = APIRouter(prefix="/koelectra", tags=["koelectra"])
 
 # 서비스 인스턴스 생성 (싱글톤 패턴)
 _service_instance: Optional[KoElectraService] = None
+# 동시에 들어온 첫 요청들이 모델을 중복 로드하지 않도록 생성 구간만 잠금
+_service_lock = threading.Lock()
 
 
 def get_service() -> KoElectraService:
     """KoElectraService 싱글톤 인스턴스 반환"""
     global _service_instance
-    if _service_instance is None:
-        logger.info("KoElectraService 인스턴스 생성 중...")
-        try:
-            _service_instance = KoElectraService()
-            logger.info("KoElectraService 인스턴스 생성 완료")
-        except Exception as e:
-            logger.error(f"KoElectraService 인스턴스 생성 실패: {str(e)}", exc_info=True)
-            raise HTTPException(
-                status_code=500,
-                detail=f"모델 로딩 실패: {str(e)}"
-            )
+    if _service_instance is not None:
+        return _service_instance
+    with _service_lock:
+        if _service_instance is None:
+            logger.info("KoElectraService 인스턴스 생성 중...")
+            try:
+                _service_instance = KoElectraService()
+                logger.info("KoElectraService 인스턴스 생성 완료")
+            except Exception as e:
+                logger.error(f"KoElectraService 인스턴스 생성 실패: {str(e)}", exc_info=True)
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"모델 로딩 실패: {str(e)}"
+                )
     return _service_instance
 
 
+# 공유 추론 워커가 있으면 이 워커에는 모델을 로드하지 않고 소켓으로 요청 (main에서 설정)
+_remote_service: Optional[RemoteKoElectraService] = (
+    RemoteKoElectraService(WORKER_SOCKET) if WORKER_SOCKET else None
+)
+
+
+async def warmup_service(app: FastAPI):
+    """서비스 시작 시 모델을 미리 로드하고 더미 입력으로 추론 (첫 요청의 콜드 스타트 제거)"""
+    if _remote_service is not None:
+        # 모델 로드와 워밍업은 추론 워커가 시작 시 이미 완료
+        logger.info(f"공유 추론 워커 사용: {WORKER_SOCKET}")
+        return
+    try:
+        service = await asyncio.to_thread(get_service)
+        app.state.koelectra = service
+        await asyncio.to_thread(service.warmup)
+        # 배치 엔드포인트/배처가 사용하는 predict_batch 경로도 한 번 실행
+        await asyncio.to_thread(service.predict_batch, ["워밍업 문장입니다.", "배치 경로 워밍업 문장입니다."])
+        # 단건 요청 배처 워커도 트래픽 전에 시작
+        get_batcher().start()
+        logger.info("KoElectraService 워밍업 완료")
+    except Exception as e:
+        logger.warning(f"KoElectraService 워밍업 실패 (요청 시 다시 시도합니다): {str(e)}")
+
+
+async def shutdown_service():
+    """서비스 종료 시 배처 워커 정리"""
+    if _batcher_instance is not None:
+        await _batcher_instance.stop()
+
+
+# 단건 분석 요청을 묶어 처리하는 배처 (시작 시 생성, 실패했으면 첫 요청 시 생성)
+_batcher_instance: Optional[SentimentBatcher] = None
+
+
+def get_batcher() -> SentimentBatcher:
+    """SentimentBatcher 싱글톤 인스턴스 반환"""
+    global _batcher_instance
+    if _batcher_instance is None:
+        _batcher_instance = SentimentBatcher(get_service())
+    return _batcher_instance
+
+
 @router.get("/")
 async def koelectra_root():
     """KoELECTRA 서비스 루트"""
@@ -102,8 +163,12 @@ async def koelectra_root():
     )
 
 
-@router.post("/analyze", response_model=Dict[str, Any])
-async def analyze_sentiment(request: SentimentAnalysisRequest):
+@router.post(
+    "/analyze",
+    response_model=Dict[str, Any],
+    openapi_extra=_request_body_schema(SentimentAnalysisRequest)
+)
+async def analyze_sentiment(request: SentimentAnalysisRequest = Depends(parse_sentiment_request)):
     """
     단일 텍스트에 대한 감정 분석
     
@@ -141,13 +206,21 @@ async def analyze_sentiment(request: SentimentAnalysisRequest):
                 detail="텍스트가 비어있습니다."
             )
         
-        service = get_service()
-        result = service.predict(request.text)
+        # 동시에 들어온 요청과 묶어 한 번의 배치 추론으로 처리 (공유 추론 워커가 있으면 워커의 배처에서)
+        if _remote_service is not None:
+            result = await _remote_service.predict(request.text)
+        else:
+            result = await get_batcher().predict(request.text)
+        if result.sentiment == "error":
+            raise HTTPException(
+                status_code=500,
+                detail=f"감정 분석 중 오류가 발생했습니다: {result.error}"
+            )
         
-        return create_response(
+        return MsgspecJSONResponse(create_response(
             data=result,
             message="감정 분석이 완료되었습니다."
-        )
+        ))
         
     except HTTPException:
         raise
@@ -162,8 +235,14 @@ async def analyze_sentiment(request: SentimentAnalysisRequest):
         )
 
 
-@router.post("/analyze-batch", response_model=Dict[str, Any])
-async def analyze_sentiment_batch(request: BatchSentimentAnalysisRequest):
+@router.post(
+    "/analyze-batch",
+    response_model=Dict[str, Any],
+    openapi_extra=_request_body_schema(BatchSentimentAnalysisRequest)
+)
+async def analyze_sentiment_batch(
+    request: BatchSentimentAnalysisRequest = Depends(parse_batch_sentiment_request)
+):
     """
     여러 텍스트에 대한 배치 감정 분석
     
@@ -225,17 +304,20 @@ async def analyze_sentiment_batch(request: BatchSentimentAnalysisRequest):
                 detail="한 번에 최대 100개의 텍스트만 처리할 수 있습니다."
             )
         
-        service = get_service()
-        results = service.predict_batch(request.texts)
+        if _remote_service is not None:
+            results = await _remote_service.predict_batch(request.texts)
+        else:
+            service = get_service()
+            results = await asyncio.to_thread(service.predict_batch, request.texts)
         
-        return create_response(
+        return MsgspecJSONResponse(create_response(
             data={
                 "results": results,
                 "total": len(results),
-                "success_count": sum(1 for r in results if r.get("sentiment") != "error")
+                "success_count": sum(1 for r in results if r.sentiment != "error")
             },
             message=f"{len(results)}개의 텍스트 분석이 완료되었습니다."
-        )
+        ))
         
     except HTTPException:
         raise
@@ -247,6 +329,13 @@ async def analyze_sentiment_batch(request: BatchSentimentAnalysisRequest):
         )
 
 
+async def _get_model_info() -> Dict[str, Any]:
+    """로컬 서비스 또는 공유 추론 워커의 모델 정보"""
+    if _remote_service is not None:
+        return await _remote_service.get_model_info()
+    return get_service().get_model_info()
+
+
 @router.get("/health", response_model=Dict[str, Any])
 async def health_check():
     """
@@ -255,8 +344,7 @@ async def health_check():
     KoELECTRA 모델이 정상적으로 로드되었는지 확인합니다.
     """
     try:
-        service = get_service()
-        model_info = service.get_model_info()
+        model_info = await _get_model_info()
         
         if model_info["is_loaded"]:
             return create_response(
@@ -284,8 +372,7 @@ async def get_model_info():
     현재 로드된 KoELECTRA 모델의 상세 정보를 조회합니다.
     """
     try:
-        service = get_service()
-        model_info = service.get_model_info()
+        model_info = await _get_model_info()
         
         return create_response(
             data=model_info,
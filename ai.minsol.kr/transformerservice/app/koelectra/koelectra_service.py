@@ -3,19 +3,74 @@ KoELECTRA 감정분석 서비스
 허깅페이스 transformers를 사용한 영화 리뷰 감정분석
 """
 import logging
+import os
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+import msgspec
 import torch
-from transformers import (
-    AutoTokenizer,
-    AutoModelForSequenceClassification,
-    ElectraForSequenceClassification,
-    ElectraModel
-)
+from transformers import AutoTokenizer
 import numpy as np
 
+from app.koelectra.koelectra_loader import load_classification_model
+
 logger = logging.getLogger(__name__)
 
+# torch.compile 재컴파일 횟수를 제한하기 위한 시퀀스 길이 버킷 (입력은 가장 가까운 버킷 길이로 패딩)
+SEQ_LEN_BUCKETS = (32, 64, 128, 256, 512)
+# 컴파일 시 시간/메모리 사용량이 크게 튀므로 기본값은 CUDA에서만 사용 (CPU는 워커마다 컴파일하므로 끔)
+USE_TORCH_COMPILE = os.getenv("USE_TORCH_COMPILE", "1" if torch.cuda.is_available() else "0") == "1"
+# 시작 시 미리 컴파일할 버킷 (영화 리뷰는 대부분 짧으므로 긴 버킷은 첫 요청 시 컴파일)
+WARMUP_SEQ_LEN_BUCKETS = tuple(
+    int(length) for length in os.getenv("KOELECTRA_WARMUP_BUCKETS", "32,64,128").split(",") if length.strip()
+)
+
+# GPU 전송용 고정 메모리 버퍼 크기 (/analyze-batch 최대 100건, 최대 토큰 길이 512)
+MAX_BATCH_SIZE = 100
+MAX_SEQ_LEN = 512
+
+# USE_ORT=1이면 export_onnx.py로 만든 ONNX 모델을 ONNX Runtime으로 추론
+# (CPU는 int8 양자화 모델, CUDA는 어텐션 등이 융합된 fp32 최적화 모델)
+USE_ORT = os.getenv("USE_ORT", "0") == "1"
+ORT_MODEL_FILENAME = "model_int8.onnx"
+ORT_GPU_MODEL_FILENAME = "model_optimized.onnx"
+# CPU torch 추론 시 Linear 레이어를 int8 동적 양자화 (KOELECTRA_CPU_INT8=0이면 fp32 유지)
+CPU_INT8 = os.getenv("KOELECTRA_CPU_INT8", "1") == "1"
+
+# uvicorn 워커 수(WEB_CONCURRENCY)만큼 코어를 나눠 워커당 torch 스레드 수 결정 (CPU 과다 구독 방지)
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+TORCH_NUM_THREADS = int(os.getenv("TORCH_NUM_THREADS", max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY)))
+# CPU 배치 추론 시 청크 크기와 동시에 실행할 청크 수 (torch/ORT는 추론 중 GIL을 해제)
+BATCH_CHUNK_SIZE = 32
+BATCH_WORKERS = max(1, int(os.getenv("KOELECTRA_BATCH_WORKERS", "2")))
+
+# 같은 텍스트 재요청(재시도/새로고침/중복 리뷰) 시 추론을 건너뛰기 위한 LRU 결과 캐시 크기
+PREDICTION_CACHE_SIZE = 4096
+
+
+class SentimentScores(msgspec.Struct, frozen=True):
+    """클래스별 확률"""
+    positive: float
+    negative: float
+
+
+class SentimentResult(msgspec.Struct, frozen=True, kw_only=True, omit_defaults=True):
+    """
+    감정 분석 결과 (고정 필드 구조체, msgspec으로 바로 JSON 인코딩)
+    
+    불변이므로 캐시된 결과를 복사 없이 그대로 반환. text는 predict_ids처럼 원문이 없으면,
+    error는 성공 시 JSON에서 생략
+    """
+    text: Optional[str] = None
+    sentiment: str
+    confidence: float
+    scores: SentimentScores
+    error: Optional[str] = None
+
 
 class KoElectraService:
     """KoELECTRA 모델을 사용한 감정분석 서비스 (싱글톤 패턴)"""
@@ -23,23 +78,70 @@ class KoElectraService:
     _instance: Optional['KoElectraService'] = None
     _initialized: bool = False
     
-    def __new__(cls):
+    def __new__(cls, num_threads: Optional[int] = None):
         """싱글톤 패턴 구현"""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
     
-    def __init__(self):
-        """서비스 초기화 (한 번만 실행)"""
+    def __init__(self, num_threads: Optional[int] = None):
+        """
+        서비스 초기화 (한 번만 실행)
+        
+        Args:
+            num_threads: CPU torch 스레드 수 (없으면 TORCH_NUM_THREADS)
+        """
         if self._initialized:
             return
         
         self.model = None
+        self.compiled_model = None
+        self.ort_session = None
+        self.ort_device = "cpu"
         self.tokenizer = None
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        # CUDA에서는 반정밀도로 추론 (bf16 미지원 GPU는 fp16)
+        self.use_amp = self.device.type == "cuda"
+        self.amp_dtype = torch.bfloat16 if self.use_amp and torch.cuda.is_bf16_supported() else torch.float16
         self.model_path = Path(__file__).parent / "koelectra_model"
+        # fast 토크나이저는 호출마다 내부 padding/truncation 상태를 바꾸므로
+        # 여러 스레드에서 동시에 호출하지 않도록 보호 ("Already borrowed" 오류 방지)
+        self._tokenizer_lock = threading.Lock()
+        # CUDA에서는 호스트→GPU 복사용 고정(pinned) 메모리 버퍼를 최대 크기로 한 번만 할당해 재사용
+        # (contiguous 슬라이스를 위해 1차원으로 잡고 호출마다 (B, L)로 view)
+        self._input_buffers: Dict[str, torch.Tensor] = {}
+        self._buffer_lock = threading.Lock()
+        if self.device.type == "cuda":
+            self._input_buffers = {
+                name: torch.zeros(MAX_BATCH_SIZE * MAX_SEQ_LEN, dtype=torch.long, pin_memory=True)
+                for name in ("input_ids", "attention_mask", "token_type_ids")
+            }
+            # 반복되는 입력 형태(버킷 길이)에 맞는 cuDNN 알고리즘을 한 번 골라 재사용
+            torch.backends.cudnn.benchmark = True
         
-        logger.info(f"KoElectraService 초기화 시작 (Device: {self.device})")
+        # 텍스트 -> 분석 결과 LRU 캐시 (배처/배치 엔드포인트 스레드가 함께 사용하므로 잠금)
+        self._prediction_cache: "OrderedDict[str, SentimentResult]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        
+        # CPU 배치 추론 청크를 병렬로 실행할 스레드 풀 (GPU에서는 한 번의 배치로 처리)
+        self._batch_executor: Optional[ThreadPoolExecutor] = None
+        if self.device.type == "cpu":
+            # 청크 스레드마다 intra-op 스레드 팀이 생기므로 워커 수로 나눠 코어 과다 구독 방지
+            torch.set_num_threads(max(1, (num_threads or TORCH_NUM_THREADS) // BATCH_WORKERS))
+            try:
+                # 연산 간 병렬화는 청크 스레드가 담당하므로 inter-op 스레드는 1개
+                torch.set_num_interop_threads(1)
+            except RuntimeError:
+                # 이미 병렬 작업이 시작된 뒤에는 변경할 수 없음
+                pass
+            if BATCH_WORKERS > 1:
+                self._batch_executor = ThreadPoolExecutor(
+                    max_workers=BATCH_WORKERS, thread_name_prefix="koelectra-batch"
+                )
+        
+        logger.info(f"KoElectraService 초기화 시작 (Device: {self.device}, torch threads: {torch.get_num_threads()})")
         logger.info(f"모델 경로: {self.model_path}")
         
         try:
@@ -63,52 +165,81 @@ class KoElectraService:
             
             logger.info("토크나이저 로딩 중...")
             # 토크나이저 로드
+            # Rust 기반 fast 토크나이저 사용 (배치 입력을 내부에서 병렬 처리)
             self.tokenizer = AutoTokenizer.from_pretrained(
                 str(self.model_path),
-                do_lower_case=False
+                do_lower_case=False,
+                use_fast=True
             )
             logger.info("토크나이저 로딩 완료")
             
+            if USE_ORT and self._load_ort_session():
+                # ONNX Runtime 세션이 준비되면 torch 모델은 메모리에 올리지 않음
+                return
+            
             logger.info("모델 로딩 중...")
-            # 모델 로드 시도
-            # 먼저 SequenceClassification으로 시도
-            try:
-                self.model = AutoModelForSequenceClassification.from_pretrained(
-                    str(self.model_path)
-                )
-                logger.info("AutoModelForSequenceClassification으로 모델 로딩 성공")
-            except Exception as e1:
-                logger.warning(f"AutoModelForSequenceClassification 로딩 실패: {e1}")
-                # ElectraForSequenceClassification으로 시도
-                try:
-                    self.model = ElectraForSequenceClassification.from_pretrained(
-                        str(self.model_path)
-                    )
-                    logger.info("ElectraForSequenceClassification으로 모델 로딩 성공")
-                except Exception as e2:
-                    logger.warning(f"ElectraForSequenceClassification 로딩 실패: {e2}")
-                    # Base 모델로 로드 후 분류 헤드 추가
-                    logger.info("Base Electra 모델로 로드 시도 중...")
-                    from transformers import ElectraConfig
-                    base_model = ElectraModel.from_pretrained(str(self.model_path))
-                    # config를 수정하여 분류 헤드 추가
-                    config = base_model.config
-                    config.num_labels = 2
-                    self.model = ElectraForSequenceClassification(config)
-                    self.model.electra = base_model
-                    logger.info("Base 모델 + 분류 헤드로 모델 구성 완료")
+            # config.json의 architectures로 로드 방식을 결정 (실패할 로드를 먼저 시도하지 않음)
+            # .bin 체크포인트는 convert_safetensors.py로 배포 전에 변환 (서빙 중에는 모델 디렉토리에 쓰지 않음)
+            self.model = load_classification_model(self.model_path, num_labels=2, **self._pretrained_kwargs())
             
             # 모델을 디바이스로 이동
             self.model.to(self.device)
+            if self.use_amp:
+                # 가중치도 반정밀도로 변환하여 메모리 대역폭 절반으로 (tensor core 사용)
+                self.model.to(self.amp_dtype)
             self.model.eval()  # 평가 모드로 설정
+            # 추론 전용이므로 파라미터의 gradient 추적을 끔
+            self.model.requires_grad_(False)
+            quantized = self.device.type == "cpu" and CPU_INT8 and self._quantize_model()
             
             logger.info(f"모델이 {self.device}로 로드되었습니다")
+            # 동적 int8 양자화 모델은 dynamo가 제대로 처리하지 못하므로 컴파일하지 않음
+            if USE_TORCH_COMPILE and not quantized:
+                self._compile_model()
             
         except Exception as e:
             logger.error(f"모델 로딩 중 오류 발생: {str(e)}", exc_info=True)
             raise
     
-    def predict(self, text: str) -> Dict[str, any]:
+    def _pretrained_kwargs(self) -> Dict[str, any]:
+        """
+        from_pretrained 가중치 로드 옵션
+        
+        safetensors 파일은 mmap으로 바로 읽고(pickle 역직렬화 없음), low_cpu_mem_usage로
+        랜덤 초기화용 중간 복사본을 만들지 않으며, CUDA에서는 처음부터 반정밀도로 로드
+        """
+        return {
+            # safetensors 파일이 없으면 None(자동 선택)으로 두어 .bin 체크포인트도 로드
+            "use_safetensors": True if (self.model_path / "model.safetensors").exists() else None,
+            "low_cpu_mem_usage": True,
+            "torch_dtype": self.amp_dtype if self.use_amp else torch.float32,
+        }
+    
+    def _load_ort_session(self) -> bool:
+        """ONNX Runtime 세션 생성 (ONNX 모델이 없거나 실패하면 False를 반환하고 torch로 추론)"""
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            logger.warning("onnxruntime이 설치되지 않아 torch로 추론합니다")
+            return False
+        
+        use_cuda = self.device.type == "cuda" and "CUDAExecutionProvider" in ort.get_available_providers()
+        onnx_path = self.model_path / (ORT_GPU_MODEL_FILENAME if use_cuda else ORT_MODEL_FILENAME)
+        if not onnx_path.exists():
+            # 변환은 워커 시작 전 main(또는 export_onnx.py)에서 한 번만 수행, 서빙 경로에서는 로드만
+            logger.warning(f"ONNX 모델을 찾을 수 없어 torch로 추론합니다 (export_onnx.py로 변환): {onnx_path}")
+            return False
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        providers = ["CUDAExecutionProvider", "CPUExecutionProvider"] if use_cuda else ["CPUExecutionProvider"]
+        self.ort_session = ort.InferenceSession(str(onnx_path), sess_options=options, providers=providers)
+        self.ort_device = "cuda" if use_cuda else "cpu"
+        self._ort_input_names = [node.name for node in self.ort_session.get_inputs()]
+        logger.info(f"ONNX Runtime 세션 로드 완료: {onnx_path} ({providers[0]})")
+        return True
+    
+    def predict(self, text: str) -> SentimentResult:
         """
         단일 텍스트에 대한 감정 분석
         
@@ -116,9 +247,9 @@ class KoElectraService:
             text: 분석할 텍스트
             
         Returns:
-            감정 분석 결과 딕셔너리
+            감정 분석 결과
         """
-        if self.model is None or self.tokenizer is None:
+        if (self.model is None and self.ort_session is None) or self.tokenizer is None:
             raise RuntimeError("모델이 로드되지 않았습니다. 서비스를 먼저 초기화해주세요.")
         
         try:
@@ -127,51 +258,218 @@ class KoElectraService:
             if not text:
                 raise ValueError("입력 텍스트가 비어있습니다.")
             
-            # 토크나이징
-            inputs = self.tokenizer(
-                text,
-                return_tensors="pt",
-                padding=True,
-                truncation=True,
-                max_length=512
-            )
+            cached = self._cache_get(text)
+            if cached is not None:
+                return cached
             
-            # 디바이스로 이동
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-            
-            # 추론
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                logits = outputs.logits
-            
-            # 확률 계산
-            probabilities = torch.softmax(logits, dim=-1)
-            probabilities = probabilities.cpu().numpy()[0]
-            
-            # 결과 해석
-            # 일반적으로 0: negative, 1: positive
-            negative_score = float(probabilities[0])
-            positive_score = float(probabilities[1])
-            
-            # 감정 결정
-            sentiment = "positive" if positive_score > negative_score else "negative"
-            confidence = max(positive_score, negative_score)
-            
-            return {
-                "text": text,
-                "sentiment": sentiment,
-                "confidence": round(confidence, 4),
-                "scores": {
-                    "positive": round(positive_score, 4),
-                    "negative": round(negative_score, 4)
-                }
-            }
+            # 배치 경로와 같은 토크나이징/추론 코드를 크기 1 배치로 사용
+            probabilities = self._predict_probabilities([text])[0]
+            
+            result = self._format_result(text, probabilities)
+            self._cache_put(text, result)
+            return result
             
         except Exception as e:
             logger.error(f"예측 중 오류 발생: {str(e)}", exc_info=True)
             raise
     
-    def predict_batch(self, texts: List[str]) -> List[Dict[str, any]]:
+    def _quantize_model(self) -> bool:
+        """CPU에서 Linear 레이어 가중치를 int8로 동적 양자화 (실패 시 fp32 유지, 적용 여부 반환)"""
+        try:
+            self.model = torch.ao.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            logger.info("CPU int8 동적 양자화 적용 완료 (Linear)")
+            return True
+        except Exception as e:
+            logger.warning(f"int8 동적 양자화 실패, fp32로 추론합니다: {str(e)}")
+            return False
+    
+    def _compile_model(self):
+        """torch.compile로 forward를 컴파일 (사용할 수 없으면 eager 모드 유지)"""
+        self.compiled_model = None
+        if not hasattr(torch, "compile"):
+            return
+        try:
+            import torch._dynamo
+            # 버킷 길이 x 배치 크기 조합만큼 그래프가 생기므로 캐시 한도를 넉넉히
+            torch._dynamo.config.cache_size_limit = 16
+            self.compiled_model = torch.compile(self.model)
+            logger.info(f"torch.compile 적용 완료 (시퀀스 길이 버킷: {SEQ_LEN_BUCKETS})")
+        except Exception as e:
+            logger.warning(f"torch.compile 적용 실패, eager 모드로 추론합니다: {str(e)}")
+    
+    def warmup(self):
+        """
+        더미 입력으로 미리 추론하여 커널 초기화와 torch.compile 그래프 생성을 서비스 시작 시점에 처리
+        
+        컴파일된 모델이면 자주 쓰는 버킷(WARMUP_SEQ_LEN_BUCKETS)마다 배치 크기 1, 2로 한 번씩 실행해
+        (배치 축을 동적 형태로 컴파일) 짧은 리뷰 요청 중에는 재컴파일이 일어나지 않도록 함
+        """
+        lengths = (WARMUP_SEQ_LEN_BUCKETS or SEQ_LEN_BUCKETS[:1]) if self.compiled_model is not None else SEQ_LEN_BUCKETS[:1]
+        for length in lengths:
+            for batch_size in (1, 2):
+                with self._tokenizer_lock:
+                    inputs = self.tokenizer(
+                        ["워밍업 문장입니다."] * batch_size,
+                        return_tensors="pt",
+                        padding="max_length",
+                        truncation=True,
+                        max_length=length
+                    )
+                self._forward(inputs)
+        logger.info(f"모델 워밍업 완료 (시퀀스 길이: {lengths})")
+    
+    def _pad_to_bucket(self, inputs: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+        """시퀀스 길이를 가장 가까운 버킷 길이로 패딩 (컴파일된 그래프 재사용)"""
+        length = inputs["input_ids"].shape[1]
+        bucket = next((b for b in SEQ_LEN_BUCKETS if b >= length), length)
+        if bucket == length:
+            return inputs
+        padded = {}
+        for key, value in inputs.items():
+            pad_value = self.tokenizer.pad_token_id if key == "input_ids" else 0
+            padded[key] = torch.nn.functional.pad(value, (0, bucket - length), value=pad_value)
+        return padded
+    
+    def _to_device(self, inputs: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+        """입력 텐서를 디바이스로 이동 (CUDA에서는 고정 메모리 버퍼를 거쳐 비동기 복사)"""
+        if not self._input_buffers:
+            return {k: v.to(self.device) for k, v in inputs.items()}
+        moved = {}
+        for key, value in inputs.items():
+            buffer = self._input_buffers.get(key)
+            rows, cols = value.shape
+            if buffer is None or rows > MAX_BATCH_SIZE or cols > MAX_SEQ_LEN:
+                # 버퍼보다 큰 입력도 고정 메모리를 거쳐 비동기 복사 (기본 스트림이라 forward가 복사 완료를 기다림)
+                moved[key] = value.pin_memory().to(self.device, non_blocking=True)
+                continue
+            staged = buffer[:rows * cols].view(rows, cols)
+            staged.copy_(value)
+            moved[key] = staged.to(self.device, non_blocking=True)
+        return moved
+    
+    def _forward_ort(self, inputs: Dict[str, torch.Tensor]) -> List[List[float]]:
+        """ONNX Runtime으로 추론하여 클래스 확률 (batch, num_labels) 반환"""
+        feed = {name: inputs[name].numpy() for name in self._ort_input_names if name in inputs}
+        logits = self.ort_session.run(None, feed)[0].astype(np.float32)
+        logits -= logits.max(axis=-1, keepdims=True)
+        exp = np.exp(logits)
+        return (exp / exp.sum(axis=-1, keepdims=True)).tolist()
+    
+    def _forward(self, inputs: Dict[str, torch.Tensor]) -> List[List[float]]:
+        """토크나이저 출력으로 추론하여 클래스 확률 (batch, num_labels) 반환"""
+        if self.ort_session is not None:
+            return self._forward_ort(inputs)
+        model = self.compiled_model or self.model
+        if self.compiled_model is not None:
+            inputs = self._pad_to_bucket(inputs)
+        
+        # 고정 메모리 버퍼는 결과를 CPU로 가져올 때까지(복사 완료 보장) 한 호출만 사용
+        with self._buffer_lock if self._input_buffers else nullcontext():
+            # 디바이스로 이동
+            inputs = self._to_device(inputs)
+            
+            # autograd 추적을 완전히 끄고, CUDA에서는 bf16/fp16 autocast
+            with torch.inference_mode(), torch.autocast(
+                device_type=self.device.type, dtype=self.amp_dtype, enabled=self.use_amp
+            ):
+                try:
+                    logits = model(**inputs).logits
+                except Exception as e:
+                    if model is self.model:
+                        raise
+                    # 컴파일은 첫 호출 시점에 일어나므로 실패하면 eager 모드로 전환
+                    logger.warning(f"컴파일된 모델 추론 실패, eager 모드로 전환합니다: {str(e)}")
+                    self.compiled_model = None
+                    logits = self.model(**inputs).logits
+            
+            # 확률 보정을 위해 softmax는 fp32로 계산, numpy 배열을 거치지 않고 바로 파이썬 리스트로 변환
+            return torch.softmax(logits.float(), dim=-1).tolist()
+    
+    def _cache_get(self, text: str) -> Optional[SentimentResult]:
+        """캐시된 분석 결과 반환 (없으면 None)"""
+        with self._cache_lock:
+            result = self._prediction_cache.get(text)
+            if result is None:
+                self._cache_misses += 1
+                return None
+            self._prediction_cache.move_to_end(text)
+            self._cache_hits += 1
+        return result
+    
+    def _cache_put(self, text: str, result: SentimentResult):
+        """분석 결과를 캐시에 저장 (가장 오래 사용하지 않은 항목부터 제거)"""
+        with self._cache_lock:
+            self._prediction_cache[text] = result
+            self._prediction_cache.move_to_end(text)
+            if len(self._prediction_cache) > PREDICTION_CACHE_SIZE:
+                self._prediction_cache.popitem(last=False)
+    
+    @staticmethod
+    def _format_result(text: Optional[str], probabilities: List[float]) -> SentimentResult:
+        """클래스 확률을 감정 분석 결과로 변환"""
+        # 결과 해석
+        # 일반적으로 0: negative, 1: positive
+        negative_score, positive_score = probabilities
+        
+        # 감정 결정 (신뢰도는 반올림한 점수 중 큰 값이므로 반올림은 점수당 한 번만)
+        sentiment = "positive" if positive_score > negative_score else "negative"
+        scores = SentimentScores(positive=round(positive_score, 4), negative=round(negative_score, 4))
+        
+        return SentimentResult(
+            text=text,
+            sentiment=sentiment,
+            confidence=max(scores.positive, scores.negative),
+            scores=scores
+        )
+    
+    @staticmethod
+    def _error_result(text: str, error: Exception) -> SentimentResult:
+        """분석 실패 텍스트의 결과"""
+        return SentimentResult(
+            text=text,
+            sentiment="error",
+            confidence=0.0,
+            scores=SentimentScores(positive=0.0, negative=0.0),
+            error=str(error)
+        )
+    
+    def _predict_probabilities(self, texts: List[str]) -> List[List[float]]:
+        """
+        텍스트 리스트를 한 번에 토크나이징하고 클래스 확률 계산
+        
+        토큰 길이를 SEQ_LEN_BUCKETS 기준으로 묶어 버킷별로 forward
+        (짧은 리뷰가 같은 배치의 긴 리뷰 길이만큼 패딩되지 않도록 함)
+        """
+        with self._tokenizer_lock:
+            encoding = self.tokenizer(
+                texts,
+                padding=False,
+                truncation=True,
+                max_length=MAX_SEQ_LEN
+            )
+        
+        buckets: Dict[int, List[int]] = {}
+        for i, ids in enumerate(encoding["input_ids"]):
+            buckets.setdefault(bisect_left(SEQ_LEN_BUCKETS, len(ids)), []).append(i)
+        
+        probabilities: List[Optional[List[float]]] = [None] * len(texts)
+        for bucket in sorted(buckets):
+            indices = buckets[bucket]
+            with self._tokenizer_lock:
+                inputs = self.tokenizer.pad(
+                    {key: [values[i] for i in indices] for key, values in encoding.items()},
+                    padding="longest",
+                    pad_to_multiple_of=8,
+                    return_tensors="pt"
+                )
+            # 버킷 결과를 원래 입력 순서 위치에 기록
+            for i, probs in zip(indices, self._forward(inputs)):
+                probabilities[i] = probs
+        return probabilities
+    
+    def predict_batch(self, texts: List[str]) -> List[SentimentResult]:
         """
         여러 텍스트에 대한 배치 감정 분석
         
@@ -184,33 +482,109 @@ class KoElectraService:
         if not texts:
             return []
         
-        results = []
-        for text in texts:
+        if (self.model is None and self.ort_session is None) or self.tokenizer is None:
+            raise RuntimeError("모델이 로드되지 않았습니다. 서비스를 먼저 초기화해주세요.")
+        
+        results: List[Optional[SentimentResult]] = [None] * len(texts)
+        valid_idx = []
+        valid_texts = []
+        for i, text in enumerate(texts):
+            stripped = text.strip()
+            if not stripped:
+                results[i] = self._error_result(text, ValueError("입력 텍스트가 비어있습니다."))
+                continue
+            # 캐시에 있는 텍스트는 추론 대상에서 제외
+            results[i] = self._cache_get(stripped)
+            if results[i] is None:
+                valid_idx.append(i)
+                valid_texts.append(stripped)
+        
+        if valid_texts:
             try:
-                result = self.predict(text)
-                results.append(result)
+                if self._batch_executor is not None and len(valid_texts) > BATCH_CHUNK_SIZE:
+                    # CPU에서는 큰 배치를 청크로 나눠 스레드에서 병렬 추론
+                    # 길이순으로 정렬해 청크를 나누면 청크별 패딩 길이도 짧아짐 (결과는 원래 순서로 복원)
+                    order = sorted(range(len(valid_texts)), key=lambda i: len(valid_texts[i]))
+                    chunks = [
+                        [valid_texts[i] for i in order[start:start + BATCH_CHUNK_SIZE]]
+                        for start in range(0, len(order), BATCH_CHUNK_SIZE)
+                    ]
+                    sorted_probabilities = [
+                        probs
+                        for chunk_probs in self._batch_executor.map(self._predict_probabilities, chunks)
+                        for probs in chunk_probs
+                    ]
+                    probabilities = [None] * len(valid_texts)
+                    for i, probs in zip(order, sorted_probabilities):
+                        probabilities[i] = probs
+                else:
+                    probabilities = self._predict_probabilities(valid_texts)
+                for i, text, probs in zip(valid_idx, valid_texts, probabilities):
+                    result = self._format_result(text, probs)
+                    self._cache_put(text, result)
+                    results[i] = result
             except Exception as e:
-                logger.error(f"텍스트 '{text[:50]}...' 분석 중 오류: {str(e)}")
-                results.append({
-                    "text": text,
-                    "sentiment": "error",
-                    "confidence": 0.0,
-                    "scores": {
-                        "positive": 0.0,
-                        "negative": 0.0
-                    },
-                    "error": str(e)
-                })
+                # 배치 추론 실패 시 텍스트별로 다시 시도하여 실패한 항목만 오류로 표시
+                logger.warning(f"배치 추론 실패, 텍스트별로 재시도합니다: {str(e)}")
+                for i in valid_idx:
+                    try:
+                        results[i] = self.predict(texts[i])
+                    except Exception as item_error:
+                        logger.error(f"텍스트 '{texts[i][:50]}...' 분석 중 오류: {str(item_error)}")
+                        results[i] = self._error_result(texts[i], item_error)
         
         return results
     
+    def predict_ids(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> List[SentimentResult]:
+        """
+        이미 토크나이징된 입력에 대한 배치 감정 분석 (토크나이징을 상위 서비스에서 처리하는 클라이언트용)
+        
+        Args:
+            input_ids: 토큰 ID (batch, seq_len)
+            attention_mask: 어텐션 마스크 (batch, seq_len)
+            
+        Returns:
+            감정 분석 결과 리스트 (원문이 없으므로 text 필드 제외)
+        """
+        if (self.model is None and self.ort_session is None) or self.tokenizer is None:
+            raise RuntimeError("모델이 로드되지 않았습니다. 서비스를 먼저 초기화해주세요.")
+        
+        input_ids = torch.as_tensor(input_ids, dtype=torch.long)
+        attention_mask = torch.as_tensor(attention_mask, dtype=torch.long)
+        if input_ids.dim() != 2 or input_ids.shape != attention_mask.shape:
+            raise ValueError(
+                f"input_ids와 attention_mask는 같은 (batch, seq_len) 형태여야 합니다: "
+                f"{tuple(input_ids.shape)} != {tuple(attention_mask.shape)}"
+            )
+        batch_size, seq_len = input_ids.shape
+        if batch_size == 0 or seq_len == 0:
+            raise ValueError("입력 토큰이 비어있습니다.")
+        if batch_size > MAX_BATCH_SIZE or seq_len > MAX_SEQ_LEN:
+            raise ValueError(
+                f"입력 크기가 너무 큽니다 (최대 {MAX_BATCH_SIZE}개, 길이 {MAX_SEQ_LEN}): {tuple(input_ids.shape)}"
+            )
+        
+        # 토크나이저 출력과 같은 형태로 맞춰 배치 추론 경로 재사용
+        inputs = {
+            "input_ids": input_ids,
+            "attention_mask": attention_mask,
+            "token_type_ids": torch.zeros_like(input_ids)
+        }
+        return [self._format_result(None, probs) for probs in self._forward(inputs)]
+    
     def get_model_info(self) -> Dict[str, any]:
         """모델 정보 반환"""
         return {
-            "model_type": type(self.model).__name__ if self.model else None,
-            "device": str(self.device),
+            "model_type": "onnxruntime" if self.ort_session else (type(self.model).__name__ if self.model else None),
+            "device": self.ort_device if self.ort_session else str(self.device),
             "model_path": str(self.model_path),
-            "is_loaded": self.model is not None and self.tokenizer is not None,
-            "vocab_size": len(self.tokenizer) if self.tokenizer else None
+            "is_loaded": (self.model is not None or self.ort_session is not None) and self.tokenizer is not None,
+            "vocab_size": len(self.tokenizer) if self.tokenizer else None,
+            "prediction_cache": {
+                "size": len(self._prediction_cache),
+                "max_size": PREDICTION_CACHE_SIZE,
+                "hits": self._cache_hits,
+                "misses": self._cache_misses
+            }
         }
 
@@ -0,0 +1,170 @@
+"""
+KoELECTRA 공유 추론 워커
+uvicorn 워커가 여러 개일 때 모델을 워커마다 올리지 않고 전용 프로세스 하나에만 로드
+각 uvicorn 워커는 Unix 소켓으로 텍스트를 보내고 결과를 받음 (모든 워커의 요청이 한 배처에 모임)
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import struct
+import time
+from typing import Any, Dict, List, Optional
+
+import msgspec
+
+from app.koelectra.koelectra_service import KoElectraService, SentimentResult
+from app.koelectra.koelectra_batcher import SentimentBatcher
+
+logger = logging.getLogger(__name__)
+
+# 설정되어 있으면 라우터는 로컬 모델 대신 이 소켓의 추론 워커를 사용 (main에서 워커 시작 후 설정)
+WORKER_SOCKET = os.getenv("KOELECTRA_WORKER_SOCKET")
+# 모델 로드/워밍업을 기다리는 최대 시간 (초)
+WORKER_START_TIMEOUT = float(os.getenv("KOELECTRA_WORKER_START_TIMEOUT", "300"))
+
+# 메시지 앞에 붙는 본문 길이 (4바이트 big-endian)
+_HEADER = struct.Struct(">I")
+
+
+class WorkerRequest(msgspec.Struct):
+    """추론 워커 요청 (op: predict, predict_batch, info)"""
+    op: str
+    texts: List[str] = []
+
+
+class WorkerResponse(msgspec.Struct, omit_defaults=True):
+    """추론 워커 응답"""
+    results: Optional[List[SentimentResult]] = None
+    info: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+_encoder = msgspec.msgpack.Encoder()
+_request_decoder = msgspec.msgpack.Decoder(WorkerRequest)
+_response_decoder = msgspec.msgpack.Decoder(WorkerResponse)
+
+
+async def _read_message(reader: asyncio.StreamReader) -> bytes:
+    (length,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    return await reader.readexactly(length)
+
+
+async def _write_message(writer: asyncio.StreamWriter, payload: bytes):
+    writer.write(_HEADER.pack(len(payload)) + payload)
+    await writer.drain()
+
+
+async def _serve(socket_path: str, ready, num_threads: int):
+    """모델을 로드하고 Unix 소켓으로 요청을 받아 처리"""
+    service = KoElectraService(num_threads=num_threads)
+    service.warmup()
+    batcher = SentimentBatcher(service)
+    batcher.start()
+
+    async def dispatch(request: WorkerRequest) -> WorkerResponse:
+        if request.op == "predict":
+            # 단건 요청은 모든 uvicorn 워커의 요청과 함께 배처에서 묶어 처리
+            return WorkerResponse(results=[await batcher.predict(request.texts[0])])
+        if request.op == "predict_batch":
+            return WorkerResponse(results=await asyncio.to_thread(service.predict_batch, request.texts))
+        if request.op == "info":
+            return WorkerResponse(info=service.get_model_info())
+        raise ValueError(f"알 수 없는 요청입니다: {request.op}")
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = _request_decoder.decode(await _read_message(reader))
+            try:
+                response = await dispatch(request)
+            except Exception as e:
+                logger.error(f"추론 워커 요청 처리 실패 ({request.op}): {str(e)}")
+                response = WorkerResponse(error=str(e))
+            await _write_message(writer, _encoder.encode(response))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            # 응답을 기다리던 클라이언트가 연결을 끊은 경우
+            pass
+        finally:
+            writer.close()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    server = await asyncio.start_unix_server(handle, path=socket_path)
+    logger.info(f"KoELECTRA 추론 워커 시작: {socket_path}")
+    ready.set()
+    async with server:
+        await server.serve_forever()
+
+
+def run_inference_worker(socket_path: str, ready, num_threads: int):
+    """추론 워커 프로세스 진입점"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    asyncio.run(_serve(socket_path, ready, num_threads))
+
+
+def start_inference_worker(
+    socket_path: str, num_threads: int
+) -> Optional[multiprocessing.process.BaseProcess]:
+    """
+    추론 워커 프로세스를 시작하고 모델 로드가 끝날 때까지 대기
+
+    Args:
+        socket_path: 요청을 받을 Unix 소켓 경로
+        num_threads: 추론 워커의 CPU torch 스레드 수 (추론은 이 프로세스에서만 하므로 보통 코어 전체)
+
+    Returns:
+        워커 프로세스 (시간 안에 준비되지 않거나 로드 중 종료되면 None)
+    """
+    # CUDA는 fork된 프로세스에서 초기화할 수 없으므로 spawn 사용
+    ctx = multiprocessing.get_context("spawn")
+    ready = ctx.Event()
+    process = ctx.Process(
+        target=run_inference_worker,
+        args=(socket_path, ready, num_threads),
+        name="koelectra-inference",
+        daemon=True
+    )
+    process.start()
+    # 모델 로드 중 프로세스가 죽으면(체크포인트 오류, OOM 등) 타임아웃까지 기다리지 않고 바로 포기
+    deadline = time.monotonic() + WORKER_START_TIMEOUT
+    while not ready.wait(1):
+        if not process.is_alive() or time.monotonic() >= deadline:
+            break
+    if ready.is_set() and process.is_alive():
+        return process
+    logger.error(f"KoELECTRA 추론 워커 시작 실패 (exitcode: {process.exitcode}), 워커별로 모델을 로드합니다.")
+    process.terminate()
+    return None
+
+
+class RemoteKoElectraService:
+    """추론 워커에 요청을 보내는 uvicorn 워커 측 클라이언트 (요청마다 짧은 Unix 소켓 연결)"""
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+
+    async def _call(self, request: WorkerRequest) -> WorkerResponse:
+        reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        try:
+            await _write_message(writer, _encoder.encode(request))
+            response = _response_decoder.decode(await _read_message(reader))
+        finally:
+            writer.close()
+        if response.error is not None:
+            raise RuntimeError(response.error)
+        return response
+
+    async def predict(self, text: str) -> SentimentResult:
+        """단일 텍스트 감정 분석"""
+        return (await self._call(WorkerRequest(op="predict", texts=[text]))).results[0]
+
+    async def predict_batch(self, texts: List[str]) -> List[SentimentResult]:
+        """배치 감정 분석"""
+        return (await self._call(WorkerRequest(op="predict_batch", texts=texts))).results
+
+    async def get_model_info(self) -> Dict[str, Any]:
+        """추론 워커의 모델 정보"""
+        return (await self._call(WorkerRequest(op="info"))).info
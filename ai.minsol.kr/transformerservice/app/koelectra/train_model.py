@@ -2,25 +2,28 @@
 KoELECTRA 모델 훈련 스크립트
 영화 리뷰 데이터를 사용한 감정분석 fine-tuning
 """
+import array
 import json
 import os
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import torch
 from torch.utils.data import Dataset
 from transformers import (
     AutoTokenizer,
-    AutoModelForSequenceClassification,
-    ElectraForSequenceClassification,
-    ElectraModel,
-    ElectraConfig,
     TrainingArguments,
     Trainer,
     DataCollatorWithPadding
 )
 from sklearn.model_selection import train_test_split
 import numpy as np
+try:
+    from app.koelectra.koelectra_loader import load_classification_model
+except ImportError:
+    # 스크립트로 직접 실행한 경우 (python train_model.py)
+    from koelectra_loader import load_classification_model
 try:
     from datasets import load_metric
 except ImportError:
@@ -45,80 +48,95 @@ logger = logging.getLogger(__name__)
 
 
 class SentimentDataset(Dataset):
-    """감정분석 데이터셋"""
+    """감정분석 데이터셋 (생성 시 전체 텍스트를 한 번만 토크나이징)"""
     
-    def __init__(self, texts: List[str], labels: List[int], tokenizer, max_length: int = 512):
-        self.texts = texts
-        self.labels = labels
-        self.tokenizer = tokenizer
+    def __init__(self, texts: List[str], labels: np.ndarray, tokenizer, max_length: int = 512):
         self.max_length = max_length
+        
+        # 샘플/에포크마다 토크나이저를 호출하지 않도록 전체 코퍼스를 한 번에 인코딩
+        # 패딩은 하지 않고 DataCollatorWithPadding이 배치 내 최대 길이로 패딩 (리뷰는 대부분 짧음)
+        encoding = tokenizer(
+            [str(text) for text in texts],
+            truncation=True,
+            padding=False,
+            max_length=max_length
+        )
+        self.input_ids = encoding['input_ids']
+        self.attention_mask = encoding['attention_mask']
+        # int8 라벨 배열을 복사 없이 텐서로 감싼 뒤 한 번만 long으로 변환
+        self.labels = torch.from_numpy(np.ascontiguousarray(labels)).long()
     
     def __len__(self):
-        return len(self.texts)
+        return len(self.labels)
     
     def __getitem__(self, idx):
-        text = str(self.texts[idx])
-        label = self.labels[idx]
-        
-        encoding = self.tokenizer(
-            text,
-            truncation=True,
-            padding='max_length',
-            max_length=self.max_length,
-            return_tensors='pt'
-        )
-        
         return {
-            'input_ids': encoding['input_ids'].flatten(),
-            'attention_mask': encoding['attention_mask'].flatten(),
-            'labels': torch.tensor(label, dtype=torch.long)
+            'input_ids': self.input_ids[idx],
+            'attention_mask': self.attention_mask[idx],
+            'labels': self.labels[idx]
         }
 
 
-def load_review_data(data_dir: Path) -> Tuple[List[str], List[int]]:
+def _to_int(value) -> Optional[int]:
+    """rating 값을 정수로 변환 (변환할 수 없으면 None)"""
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _parse_review_file(json_file: Path) -> Tuple[List[str], List[int]]:
+    """JSON 파일 하나를 파싱하여 (리뷰 텍스트, 라벨) 반환 (프로세스 풀에서 파일별로 실행)"""
+    raw = json_file.read_bytes()
+    # orjson이 설치된 경우 더 빠른 파서 사용 (지연 import)
+    try:
+        import orjson
+        data = orjson.loads(raw)
+    except ImportError:
+        data = json.loads(raw)
+    
+    # 리뷰가 비어 있거나 rating이 정수가 아니면 제외, 5 이상은 positive(1), 5 미만은 negative(0)
+    pairs = [
+        (review, 1 if rating >= 5 else 0)
+        for item in data
+        if (review := item.get('review', '').strip())
+        and (rating := _to_int(item.get('rating', '5'))) is not None
+    ]
+    return [review for review, _ in pairs], [label for _, label in pairs]
+
+
+def load_review_data(data_dir: Path) -> Tuple[List[str], np.ndarray]:
     """
-    JSON 파일들에서 리뷰 데이터 로드
+    JSON 파일들에서 리뷰 데이터 로드 (파일별로 병렬 파싱)
     
     Returns:
         texts: 리뷰 텍스트 리스트
-        labels: 감정 라벨 리스트 (0: negative, 1: positive)
+        labels: 감정 라벨 배열 (np.int8, 0: negative, 1: positive)
     """
     texts = []
-    labels = []
+    # 라벨은 int 객체 리스트 대신 연속 메모리(1바이트/샘플)에 누적
+    labels = array.array('b')
     
-    json_files = list(data_dir.glob("*.json"))
+    json_files = sorted(data_dir.glob("*.json"))
     logger.info(f"총 {len(json_files)}개의 JSON 파일 발견")
     
-    for json_file in json_files:
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-                for item in data:
-                    review = item.get('review', '').strip()
-                    rating = item.get('rating', '5')
-                    
-                    if not review:
-                        continue
-                    
-                    # rating을 정수로 변환
-                    try:
-                        rating_int = int(rating)
-                    except (ValueError, TypeError):
-                        continue
-                    
-                    # 5 이상은 positive(1), 5 미만은 negative(0)
-                    label = 1 if rating_int >= 5 else 0
-                    
-                    texts.append(review)
-                    labels.append(label)
-        
-        except Exception as e:
-            logger.warning(f"파일 {json_file} 로드 중 오류: {str(e)}")
-            continue
+    # 파일끼리 독립적이므로 여러 프로세스에서 동시에 파싱 (결과는 파일 순서대로 합침)
+    with ProcessPoolExecutor(max_workers=min(len(json_files), os.cpu_count() or 1) or 1) as executor:
+        futures = [(json_file, executor.submit(_parse_review_file, json_file)) for json_file in json_files]
+        for json_file, future in futures:
+            try:
+                file_texts, file_labels = future.result()
+            except Exception as e:
+                logger.warning(f"파일 {json_file} 로드 중 오류: {str(e)}")
+                continue
+            texts.extend(file_texts)
+            labels.extend(file_labels)
+    
+    labels = np.frombuffer(labels, dtype=np.int8)
+    positive_count = int(np.count_nonzero(labels))
     
     logger.info(f"총 {len(texts)}개의 리뷰 데이터 로드 완료")
-    logger.info(f"Positive: {sum(labels)}, Negative: {len(labels) - sum(labels)}")
+    logger.info(f"Positive: {positive_count}, Negative: {len(labels) - positive_count}")
     
     return texts, labels
 
@@ -134,33 +152,14 @@ def load_model_and_tokenizer(model_path: Path, num_labels: int = 2):
     )
     logger.info("토크나이저 로드 완료")
     
-    # 모델 로드 시도
-    try:
-        # 먼저 SequenceClassification으로 시도
-        model = AutoModelForSequenceClassification.from_pretrained(
-            str(model_path),
-            num_labels=num_labels
-        )
-        logger.info("AutoModelForSequenceClassification으로 모델 로드 성공")
-    except Exception as e1:
-        logger.warning(f"AutoModelForSequenceClassification 로드 실패: {e1}")
-        try:
-            # ElectraForSequenceClassification으로 시도
-            model = ElectraForSequenceClassification.from_pretrained(
-                str(model_path),
-                num_labels=num_labels
-            )
-            logger.info("ElectraForSequenceClassification으로 모델 로드 성공")
-        except Exception as e2:
-            logger.warning(f"ElectraForSequenceClassification 로드 실패: {e2}")
-            # Base 모델로 로드 후 분류 헤드 추가
-            logger.info("Base Electra 모델로 로드 시도 중...")
-            base_model = ElectraModel.from_pretrained(str(model_path))
-            config = base_model.config
-            config.num_labels = num_labels
-            model = ElectraForSequenceClassification(config)
-            model.electra = base_model
-            logger.info("Base 모델 + 분류 헤드로 모델 구성 완료")
+    # 가중치 로드 옵션 (safetensors mmap 로드, 중간 CPU 복사본 생략)
+    load_kwargs = {
+        "use_safetensors": True if (model_path / "model.safetensors").exists() else None,
+        "low_cpu_mem_usage": True,
+    }
+    
+    # config.json의 architectures로 로드 방식을 결정 (서비스와 같은 로더 사용)
+    model = load_classification_model(model_path, num_labels=num_labels, **load_kwargs)
     
     return model, tokenizer
 
@@ -215,18 +214,24 @@ def train_model(
     
     # 모델 및 토크나이저 로드
     model, tokenizer = load_model_and_tokenizer(model_path, num_labels=2)
+    # gradient checkpointing은 캐시를 사용할 수 없으므로 끔
+    model.config.use_cache = False
     model.to(device)
     
     # 데이터셋 생성
     train_dataset = SentimentDataset(train_texts, train_labels, tokenizer)
     val_dataset = SentimentDataset(val_texts, val_labels, tokenizer)
     
-    # 데이터 콜레이터
-    data_collator = DataCollatorWithPadding(tokenizer=tokenizer)
+    # 데이터 콜레이터 (배치별 동적 패딩, fp16 tensor core를 위해 8의 배수로 맞춤)
+    data_collator = DataCollatorWithPadding(tokenizer=tokenizer, pad_to_multiple_of=8)
     
     # 출력 디렉토리 생성
     output_dir.mkdir(parents=True, exist_ok=True)
     
+    # Ampere 이상 GPU는 bf16(손실 스케일링 불필요), 그 외 GPU는 fp16
+    use_cuda = torch.cuda.is_available()
+    use_bf16 = use_cuda and torch.cuda.is_bf16_supported()
+    
     # 훈련 인자 설정
     training_args = TrainingArguments(
         output_dir=str(output_dir),
@@ -244,7 +249,15 @@ def train_model(
         greater_is_better=True,
         save_total_limit=3,
         warmup_steps=500,
-        fp16=torch.cuda.is_available(),  # GPU가 있으면 fp16 사용
+        group_by_length=True,  # 길이가 비슷한 샘플끼리 배치를 구성해 패딩 최소화
+        bf16=use_bf16,
+        fp16=use_cuda and not use_bf16,
+        gradient_checkpointing=use_cuda,  # GPU 메모리 절약용 재계산 (CPU에서는 재계산 비용만 추가)
+        torch_compile=use_cuda,  # inductor 커널 융합
+        optim="adamw_torch_fused" if use_cuda else "adamw_torch",  # fused AdamW 커널
+        # 미리 토크나이징한 메모리 데이터셋이므로 CPU에서는 워커 프로세스 생성 비용이 더 큼
+        dataloader_num_workers=4 if use_cuda else 0,
+        dataloader_pin_memory=use_cuda,
     )
     
     # Trainer 생성
@@ -5,10 +5,22 @@ KoELECTRA 기반 감정분석 서비스
 import sys
 import os
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+# HF fast 토크나이저가 워커 프로세스 안에서 Rust 스레드 풀을 사용하도록 설정 (tokenizers import 전)
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+# orjson이 설치된 경우 응답 직렬화에 ORJSONResponse 사용 (stdlib json보다 빠름)
+try:
+    import orjson  # noqa: F401
+    DefaultResponse = ORJSONResponse
+except ImportError:
+    DefaultResponse = JSONResponse
+
 # 공통 모듈 경로 추가
 current_file = Path(__file__).resolve()
 base_dir = current_file.parent.parent  # transformer 디렉토리
@@ -18,6 +30,11 @@ base_path_str = str(base_dir)
 if base_path_str not in sys.path:
     sys.path.insert(0, base_path_str)
 
+# 로컬 실행 시 저장소 루트의 common 패키지 경로 추가 (Docker에서는 /app/common으로 복사됨)
+repo_root = base_dir.parent
+if (repo_root / "common").is_dir() and str(repo_root) not in sys.path:
+    sys.path.insert(1, str(repo_root))
+
 # Docker 환경 확인 및 /app 경로 추가
 if os.path.exists("/app"):
     if "/app" not in sys.path:
@@ -45,11 +62,15 @@ logger = logging.getLogger(__name__)
 # 라우터 import
 try:
     from app.koelectra.koelectra_router import router as koelectra_router
+    from app.koelectra.koelectra_router import warmup_service as warmup_koelectra_service
+    from app.koelectra.koelectra_router import shutdown_service as shutdown_koelectra_service
     logger.info("koelectra_router import 성공")
 except ImportError as e:
     logger.error(f"koelectra_router import 실패: {e}", exc_info=True)
     from fastapi import APIRouter
     koelectra_router = APIRouter()
+    warmup_koelectra_service = None
+    shutdown_koelectra_service = None
 
 # 공통 모듈 import
 try:
@@ -64,8 +85,22 @@ except ImportError as e:
 # 로깅 설정
 logger = setup_logging(config.service_name)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서비스 시작/종료 시 실행 (모델은 트래픽 전에 로드하고 워밍업)"""
+    logger.info(f"{config.service_name} v{config.service_version} started")
+    if warmup_koelectra_service is not None:
+        await warmup_koelectra_service(app)
+    logger.info("KoELECTRA 감정분석 서비스가 시작되었습니다.")
+    yield
+    if shutdown_koelectra_service is not None:
+        await shutdown_koelectra_service()
+    logger.info(f"{config.service_name} shutting down")
+
+
 # FastAPI 앱 생성
 app = FastAPI(
+    lifespan=lifespan,
     title="Transformer Service API",
     description="""
     ## KoELECTRA 기반 감정분석 서비스 API
@@ -88,6 +123,7 @@ app = FastAPI(
     - OpenAPI Schema: `/openapi.json`
     """,
     version=config.service_version,
+    default_response_class=DefaultResponse,
     contact={
         "name": "Transformer Service Team",
         "email": "support@minsol.kr",
@@ -136,20 +172,42 @@ async def root():
     }
 
 
-@app.on_event("startup")
-async def startup_event():
-    """서비스 시작 시 실행"""
-    logger.info(f"{config.service_name} v{config.service_version} started")
-    logger.info("KoELECTRA 감정분석 서비스가 시작되었습니다.")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """서비스 종료 시 실행"""
-    logger.info(f"{config.service_name} shutting down")
-
-
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=config.port)
+    import torch
+    # GPU는 워커 1개 + 서버 측 배치로 처리하고, CPU는 워커를 여러 개 띄워 토크나이징/추론을 코어에 분산
+    default_workers = "1" if torch.cuda.is_available() else "4"
+    workers = int(os.getenv("WEB_CONCURRENCY", default_workers))
+    if os.getenv("USE_ORT", "0") == "1":
+        # ONNX 변환/최적화/양자화는 워커마다 하지 않고 워커를 띄우기 전에 한 번만
+        from app.koelectra.export_onnx import ensure_onnx_models
+        ensure_onnx_models(Path(__file__).parent / "koelectra" / "koelectra_model")
+    # KOELECTRA_SHARED_WORKER=1이면 모델을 전용 추론 프로세스 하나에만 로드하고
+    # uvicorn 워커들은 Unix 소켓으로 요청 (워커 수만큼 모델이 메모리/VRAM에 중복 로드되지 않음)
+    inference_worker = None
+    if workers > 1 and os.getenv("KOELECTRA_SHARED_WORKER", "0") == "1":
+        from app.koelectra.koelectra_worker import start_inference_worker
+        socket_path = os.getenv("KOELECTRA_WORKER_SOCKET", "/tmp/koelectra.sock")
+        # 추론은 이 프로세스에서만 하므로 torch 스레드는 코어 전체
+        num_threads = int(os.getenv("TORCH_NUM_THREADS", os.cpu_count() or 1))
+        inference_worker = start_inference_worker(socket_path, num_threads=num_threads)
+        if inference_worker is not None:
+            os.environ["KOELECTRA_WORKER_SOCKET"] = socket_path
+    if inference_worker is None:
+        # 환경에 남아 있는 소켓 경로로 uvicorn 워커가 죽은 워커에 연결하지 않도록 제거
+        os.environ.pop("KOELECTRA_WORKER_SOCKET", None)
+    # 워커별 torch 스레드 수 계산에 사용되므로 자식 프로세스에도 전달
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    try:
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=config.port,
+            workers=workers,
+            loop="uvloop",
+            http="httptools"
+        )
+    finally:
+        if inference_worker is not None:
+            inference_worker.terminate()
 